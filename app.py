@@ -5,10 +5,24 @@ import base64
 import time
 import datetime
 import threading
-from bhashini_translator import Bhashini
+from bhashini_translator import client_for, warm_up
+from bhashini_translator.audio import normalize_for_asr, wav_duration
+from bhashini_translator.vad import trim_silence
 
 load_dotenv()
 
+
+def recording_duration(audio_bytes):
+    """
+    Duration from the WAV header, or the old 16 kHz 16-bit estimate when
+    the recorder output cannot be parsed.
+    """
+    try:
+        return wav_duration(audio_bytes)
+    except ValueError:
+        return len(audio_bytes) / (16000 * 2)
+
+
 LANGUAGES = {
     "Hindi (hi)": "hi",
     "English (en)": "en", 
@@ -147,7 +161,7 @@ with left_col:
         st.success("✅ Message recorded!")
         
         # Display audio with duration
-        duration = len(staff_audio) / (16000 * 2)  # Approximate duration
+        duration = recording_duration(staff_audio)
         mins, secs = divmod(int(duration), 60)
         st.markdown(f"""
         <div style='background: #f8f9fa; padding: 10px; border-radius: 15px; border-left: 4px solid #2196f3;'>
@@ -164,35 +178,33 @@ with left_col:
                     if 'customer_lang' in st.session_state:
                         customer_lang = st.session_state.customer_lang
                         
-                        # Convert audio to base64
-                        audio_b64 = base64.b64encode(staff_audio).decode("utf-8")
-                        
-                        # Create translator (staff -> customer)
-                        staff_translator = Bhashini(sourceLanguage=staff_lang, targetLanguage=customer_lang)
-                        
-                        # ASR: Convert staff speech to text
-                        staff_translator.getPipeLineConfig("asr")
-                        staff_text = staff_translator.asr(audio_b64)
+                        # Resample to 16 kHz mono, trim leading/trailing silence and skip recordings without speech
+                        vad = trim_silence(normalize_for_asr(staff_audio).audio)
+                        if vad.isEmpty:
+                            st.warning("🔇 No speech detected. Please record your message again.")
+                        else:
+                            st.caption(f"✂️ Kept {vad.keptSeconds:.1f}s of {vad.totalSeconds:.1f}s ({vad.speechSeconds:.1f}s of speech)")
                         
-                        # Translate to customer language
-                        staff_translator.getPipeLineConfig("translation")
-                        translated_text = staff_translator.translate(staff_text)
+                            # Shared translator (staff -> customer)
+                            staff_translator = client_for(staff_lang, customer_lang)
                         
-                        # TTS: Convert translation to audio
-                        staff_translator.getPipeLineConfig("tts")
-                        translated_audio_b64 = staff_translator.tts(translated_text)
+                            # ASR -> Translation -> TTS in a single inference call
+                            turn = staff_translator.speech_turn(vad.audio)
+                            staff_text = turn.transcript
+                            translated_text = turn.translation
+                            translated_audio_b64 = turn.audioContent
                         
-                        # Store in conversation history
-                        st.session_state.conversation_history.append({
-                            'speaker': 'staff',
-                            'original_text': staff_text,
-                            'translated_text': translated_text,
-                            'audio_b64': translated_audio_b64,
-                            'original_lang': staff_lang_name,
-                            'target_lang': st.session_state.get('customer_lang_name', 'Hindi (hi)')
-                        })
+                            # Store in conversation history
+                            st.session_state.conversation_history.append({
+                                'speaker': 'staff',
+                                'original_text': staff_text,
+                                'translated_text': translated_text,
+                                'audio_b64': translated_audio_b64,
+                                'original_lang': staff_lang_name,
+                                'target_lang': st.session_state.get('customer_lang_name', 'Hindi (hi)')
+                            })
                         
-                        st.success("✅ Message sent to customer!")
+                            st.success("✅ Message sent to customer!")
                         
                 except Exception as e:
                     st.error(f"❌ Translation failed: {str(e)}")
@@ -247,6 +259,15 @@ with right_col:
     st.session_state.customer_lang = customer_lang
     st.session_state.customer_lang_name = customer_lang_name
     
+    # Resolve configs for both directions in the background as soon as the pair is known
+    warmup = warm_up(staff_lang, customer_lang)
+    if warmup.is_ready():
+        st.caption("🟢 Translation ready")
+    elif warmup.status == warmup.FAILED:
+        st.caption(f"🔴 Could not prepare translation: {warmup.error}")
+    else:
+        st.caption("🟡 Preparing translation...")
+    
     # Center the recording section
     st.markdown("<div style='text-align: center;'>", unsafe_allow_html=True)
     st.markdown("### 🎤 Record Your Response")
@@ -287,7 +308,7 @@ with right_col:
         st.success("✅ Response recorded!")
         
         # Display audio with duration
-        duration = len(customer_audio) / (16000 * 2)  # Approximate duration  
+        duration = recording_duration(customer_audio)  
         mins, secs = divmod(int(duration), 60)
         st.markdown(f"""
         <div style='background: #f8f9fa; padding: 10px; border-radius: 15px; border-left: 4px solid #27ae60;'>
@@ -300,35 +321,33 @@ with right_col:
         if st.button("🚀 Send to Staff", key="send_customer_msg", type="primary"):
             with st.spinner("🔄 Translating response..."):
                 try:
-                    # Convert audio to base64
-                    audio_b64 = base64.b64encode(customer_audio).decode("utf-8")
-                    
-                    # Create translator (customer -> staff)
-                    customer_translator = Bhashini(sourceLanguage=customer_lang, targetLanguage=staff_lang)
+                    # Resample to 16 kHz mono, trim leading/trailing silence and skip recordings without speech
+                    vad = trim_silence(normalize_for_asr(customer_audio).audio)
+                    if vad.isEmpty:
+                        st.warning("🔇 No speech detected. Please record your message again.")
+                    else:
+                        st.caption(f"✂️ Kept {vad.keptSeconds:.1f}s of {vad.totalSeconds:.1f}s ({vad.speechSeconds:.1f}s of speech)")
                     
-                    # ASR: Convert customer speech to text
-                    customer_translator.getPipeLineConfig("asr")
-                    customer_text = customer_translator.asr(audio_b64)
+                        # Shared translator (customer -> staff)
+                        customer_translator = client_for(customer_lang, staff_lang)
                     
-                    # Translate to staff language
-                    customer_translator.getPipeLineConfig("translation")
-                    translated_text = customer_translator.translate(customer_text)
+                        # ASR -> Translation -> TTS in a single inference call
+                        turn = customer_translator.speech_turn(vad.audio)
+                        customer_text = turn.transcript
+                        translated_text = turn.translation
+                        translated_audio_b64 = turn.audioContent
                     
-                    # TTS: Convert translation to audio
-                    customer_translator.getPipeLineConfig("tts")
-                    translated_audio_b64 = customer_translator.tts(translated_text)
-                    
-                    # Store in conversation history
-                    st.session_state.conversation_history.append({
-                        'speaker': 'customer',
-                        'original_text': customer_text,
-                        'translated_text': translated_text,
-                        'audio_b64': translated_audio_b64,
-                        'original_lang': customer_lang_name,
-                        'target_lang': staff_lang_name
-                    })
+                        # Store in conversation history
+                        st.session_state.conversation_history.append({
+                            'speaker': 'customer',
+                            'original_text': customer_text,
+                            'translated_text': translated_text,
+                            'audio_b64': translated_audio_b64,
+                            'original_lang': customer_lang_name,
+                            'target_lang': staff_lang_name
+                        })
                     
-                    st.success("✅ Response sent to railway staff!")
+                        st.success("✅ Response sent to railway staff!")
                     
                 except Exception as e:
                     st.error(f"❌ Translation failed: {str(e)}")
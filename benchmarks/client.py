@@ -0,0 +1,218 @@
+"""
+Micro-benchmarks of the client's hot paths against a local mock server.
+
+    python -m benchmarks.client --output bench.json
+    python -m benchmarks.client --compare bench.json
+
+Results are written as JSON, one entry per benchmark with timings in
+microseconds. The in-memory benchmarks are also run once under
+tracemalloc: peakBytes is the most memory allocated at any point during
+the call, and overheadBytes is the part of it freed before the call
+returned, i.e. beyond the result itself.
+
+With --compare, any benchmark whose median time or peak memory is more
+than --threshold worse than in the baseline file is reported and the
+exit status is 1.
+"""
+
+import argparse
+import base64
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from bhashini_translator.audio_codec import AudioCodec
+from bhashini_translator.bhashini_translator import Bhashini
+from bhashini_translator.config_cache import ConfigCache
+from bhashini_translator.mock_server import MockBhashini, tone_wav
+from bhashini_translator.ratelimit import ApiLimiter
+from bhashini_translator.resilience import Resilience
+from bhashini_translator.response_stream import stream_audio_content
+from bhashini_translator.scheduler import Scheduler
+from bhashini_translator.service_selector import ServiceSelector
+from bhashini_translator.single_flight import SingleFlight
+from bhashini_translator.translation_memory import TranslationMemory
+from bhashini_translator.transport import Transport
+
+speechTasks = ["asr", "translation", "tts"]
+
+# Benchmarks that do not touch the network, so their allocations are all the client's.
+memoryBenchmarks = ("payload.", "base64.", "json.", "response.")
+
+
+def bench_client(ulcaEndPoint, sourceLanguage="hi", targetLanguage="en", configCache=None) -> Bhashini:
+    """
+    A client with private state, so results do not depend on the
+    environment or on earlier benchmarks. Audio stays WAV and rate limits
+    are out of the way.
+    """
+    os.environ.setdefault("userID", "benchmark")
+    os.environ.setdefault("ulcaApiKey", "benchmark")
+    unlimited = (1e9, 1e9)
+    return Bhashini(
+        sourceLanguage,
+        targetLanguage,
+        configCache=configCache if configCache is not None else ConfigCache(),
+        transport=Transport(),
+        ulcaEndPoint=ulcaEndPoint,
+        translationMemory=TranslationMemory(),
+        resilience=Resilience(),
+        apiLimiter=ApiLimiter(budgets={"config": unlimited, "inference": unlimited}),
+        audioCodec=AudioCodec(asrFormat="wav", ttsFormat="wav"),
+        singleFlight=SingleFlight(),
+        serviceSelector=ServiceSelector(),
+        scheduler=Scheduler(),
+    )
+
+
+def measure(call, iterations, warmup) -> dict:
+    for _ in range(warmup):
+        call()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter_ns()
+        call()
+        samples.append((time.perf_counter_ns() - started) / 1000)
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "meanUs": statistics.fmean(samples),
+        "p50Us": samples[len(samples) // 2],
+        "p95Us": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "minUs": samples[0],
+        "maxUs": samples[-1],
+    }
+
+
+def measure_memory(call) -> dict:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = call()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"peakBytes": peak - before, "overheadBytes": peak - current}
+
+
+def benchmarks(mock, audioSeconds) -> dict:
+    """
+    Benchmark name -> (call, relative cost). Costlier calls get fewer
+    iterations.
+    """
+    client = bench_client(mock.ulcaEndPoint)
+    pipelineTasks = client.resolvePipeLine(speechTasks).pipelineTasks
+    nmtTasks = client.resolvePipeLine(["translation"]).pipelineTasks
+    wavBytes = tone_wav(audioSeconds, sampleRate=16000)
+    wavBase64 = base64.b64encode(wavBytes).decode("utf-8")
+    text = mock.transcript
+    response = mock.inference({"pipelineTasks": pipelineTasks, "inputData": {"audio": [{"audioContent": wavBase64}]}})
+    responseJson = json.dumps(response)
+    responseBytes = responseJson.encode("utf-8")
+    audioContent = response["pipelineResponse"][-1]["audio"][0]["audioContent"]
+
+    def stream_response():
+        return stream_audio_content(
+            (responseBytes[i : i + 16384] for i in range(0, len(responseBytes), 16384)), io.BytesIO()
+        ).finish()
+
+    def resolve_cold():
+        bench_client(mock.ulcaEndPoint).resolvePipeLine(speechTasks)
+
+    return {
+        "payload.nmt": (lambda: client.nmt_payload(text, nmtTasks), 1),
+        "payload.asr_nmt_tts.base64": (lambda: client.asr_nmt_tts_payload(wavBase64, pipelineTasks), 10),
+        "payload.asr_nmt_tts.bytes": (lambda: client.asr_nmt_tts_payload(wavBytes, pipelineTasks), 10),
+        "base64.encode": (lambda: base64.b64encode(wavBytes), 10),
+        "base64.decode": (lambda: base64.b64decode(audioContent), 10),
+        "json.dumps.response": (lambda: json.dumps(response), 10),
+        "json.loads.response": (lambda: json.loads(responseJson), 10),
+        "response.stream_audio": (stream_response, 10),
+        "config.resolve.cached": (lambda: client.resolvePipeLine(speechTasks), 1),
+        "config.resolve.cold": (resolve_cold, 100),
+        "e2e.asr_nmt_tts": (lambda: client.asr_nmt_tts(wavBytes), 100),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(iterations, audioSeconds, only=None) -> dict:
+    results = {}
+    with MockBhashini() as mock:
+        for name, (call, cost) in benchmarks(mock, audioSeconds).items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            count = max(5, iterations // cost)
+            results[name] = measure(call, count, warmup=max(1, count // 10))
+            if name.startswith(memoryBenchmarks):
+                results[name].update(measure_memory(call))
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "audioSeconds": audioSeconds,
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(report, baseline, threshold) -> list:
+    """
+    Benchmarks whose median time or peak memory got more than `threshold`
+    (a fraction) worse.
+    """
+    regressions = []
+    for name, result in report["benchmarks"].items():
+        before = baseline.get("benchmarks", {}).get(name) or {}
+        for metric in ("p50Us", "peakBytes"):
+            if before.get(metric) and metric in result:
+                change = result[metric] / before[metric] - 1
+                if change > threshold:
+                    regressions.append((f"{name} {metric}", before[metric], result[metric], change))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.client")
+    parser.add_argument("--iterations", type=int, default=1000, help="iterations of the cheapest benchmark")
+    parser.add_argument("--audio-seconds", type=float, default=5.0, help="length of the ASR input clip")
+    parser.add_argument("--only", nargs="*", help="run benchmarks whose names start with these prefixes")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown, as a fraction")
+    args = parser.parse_args(argv)
+    report = run(args.iterations, args.audio_seconds, args.only)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if not args.compare:
+        return 0
+    with open(args.compare, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.threshold)
+    for name, before, after, change in regressions:
+        print(f"REGRESSION {name}: {before:.1f} -> {after:.1f} ({change:+.0%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
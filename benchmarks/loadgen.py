@@ -0,0 +1,395 @@
+"""
+Load generator replaying counter conversations through the speech pipeline.
+
+    python -m benchmarks.loadgen --counters 20 --duration 60
+    python -m benchmarks.loadgen --corpus turns.jsonl --endpoint https://.../getModelsPipeline
+
+Each simulated counter is a thread with its own client, as in the app:
+it takes the next recorded turn, trims and resamples it, runs it through
+ASR -> NMT -> TTS, then waits an exponentially distributed think time.
+Counters share one transport, config cache, scheduler and service
+selector, like sessions of one app process.
+
+The corpus is a JSONL file with one turn per line:
+
+    {"audio": "turn_0001.wav", "source": "hi", "target": "en"}
+
+Audio paths are relative to the file. Without --corpus, synthetic turns
+are generated. Without --endpoint, a mock server is started in a
+subprocess, so its work is not counted as client CPU.
+
+The JSON report has throughput, p50/p95/p99 latency per stage, client CPU
+and peak memory, errors by kind, and the retry and scheduler counters.
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import NamedTuple
+from bhashini_translator.audio import normalize_for_asr
+from bhashini_translator.audio_codec import get_default_audio_codec
+from bhashini_translator.bhashini_translator import Bhashini
+from bhashini_translator.config_cache import ConfigCache
+from bhashini_translator.errors import BhashiniAPIError
+from bhashini_translator.mock_server import tone_wav
+from bhashini_translator.ratelimit import ApiLimiter
+from bhashini_translator.resilience import Resilience
+from bhashini_translator.scheduler import Scheduler
+from bhashini_translator.service_selector import ServiceSelector
+from bhashini_translator.single_flight import SingleFlight
+from bhashini_translator.translation_memory import TranslationMemory
+from bhashini_translator.transport import Transport
+from bhashini_translator.vad import trim_silence
+
+languagePairs = [("hi", "en"), ("en", "hi"), ("hi", "ta"), ("bn", "hi"), ("te", "en"), ("mr", "hi")]
+
+
+class Turn(NamedTuple):
+    audio: bytes
+    sourceLanguage: str
+    targetLanguage: str
+
+
+def load_corpus(path) -> list:
+    base = os.path.dirname(os.path.abspath(path))
+    turns = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            with open(os.path.join(base, item["audio"]), "rb") as audio:
+                turns.append(Turn(audio.read(), item["source"], item["target"]))
+    if not turns:
+        raise ValueError(f"No turns in corpus {path}")
+    return turns
+
+
+def synthetic_corpus(count=24, seed=0) -> list:
+    """
+    Tone clips of 1-6 seconds at 44.1 kHz, so every turn is resampled as a
+    browser recording would be, spread over a few language pairs.
+    """
+    rng = random.Random(seed)
+    return [
+        Turn(
+            tone_wav(rng.uniform(1.0, 6.0), sampleRate=44100, frequency=rng.uniform(120.0, 300.0)),
+            *languagePairs[index % len(languagePairs)],
+        )
+        for index in range(count)
+    ]
+
+
+class Recorder:
+    """
+    Collects latency samples per stage and errors by kind from every counter.
+    """
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+        self.completed = 0
+        self.lock = threading.Lock()
+
+    def stage(self, name, seconds) -> None:
+        with self.lock:
+            self.samples[name].append(seconds)
+
+    def done(self) -> None:
+        with self.lock:
+            self.completed += 1
+
+    def error(self, stage, error) -> None:
+        kind = type(error).__name__
+        if isinstance(error, BhashiniAPIError) and error.statusCode is not None:
+            kind = f"{kind} {error.statusCode}"
+        with self.lock:
+            self.errors[f"{stage}: {kind}"] += 1
+
+    def latencies(self) -> dict:
+        with self.lock:
+            samples = {name: sorted(values) for name, values in self.samples.items()}
+        return {name: percentiles(values) for name, values in samples.items()}
+
+
+def percentiles(values) -> dict:
+    def at(fraction):
+        return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+    return {
+        "count": len(values),
+        "p50Ms": at(0.50),
+        "p95Ms": at(0.95),
+        "p99Ms": at(0.99),
+        "maxMs": values[-1] * 1000,
+    }
+
+
+class Shared(NamedTuple):
+    ulcaEndPoint: str
+    configCache: ConfigCache
+    transport: Transport
+    resilience: Resilience
+    apiLimiter: ApiLimiter
+    serviceSelector: ServiceSelector
+    scheduler: Scheduler
+
+
+def counter_client(shared, turn, separateStages) -> Bhashini:
+    """
+    A client for one counter. Single-flight state is per counter, because
+    different counters never send identical audio in real use. With
+    separate stages, translation memory is off so every turn reaches NMT.
+    """
+    return Bhashini(
+        turn.sourceLanguage,
+        turn.targetLanguage,
+        configCache=shared.configCache,
+        transport=shared.transport,
+        ulcaEndPoint=shared.ulcaEndPoint,
+        translationMemory=TranslationMemory(lruSize=0) if separateStages else TranslationMemory(),
+        resilience=shared.resilience,
+        apiLimiter=shared.apiLimiter,
+        audioCodec=get_default_audio_codec(),
+        singleFlight=SingleFlight(),
+        serviceSelector=shared.serviceSelector,
+        scheduler=shared.scheduler,
+    )
+
+
+class StageFailed(Exception):
+    """
+    A stage failed and its error is already recorded.
+    """
+
+
+def timed(recorder, stage, call, *args):
+    started = time.perf_counter()
+    try:
+        result = call(*args)
+    except Exception as error:
+        recorder.error(stage, error)
+        raise StageFailed(stage) from error
+    recorder.stage(stage, time.perf_counter() - started)
+    return result
+
+
+def play_turn(recorder, shared, turn, separateStages) -> None:
+    client = counter_client(shared, turn, separateStages)
+    vad = timed(recorder, "prepare", lambda: trim_silence(normalize_for_asr(turn.audio).audio))
+    if vad.isEmpty:
+        recorder.error("prepare", ValueError("no speech"))
+        raise StageFailed("prepare")
+    if separateStages:
+        transcript = timed(recorder, "asr", client.asr, vad.audio)
+        translation = timed(recorder, "translation", client.translate, transcript)
+        # A lone TTS task speaks the client's source language, so the
+        # translation is voiced by a target-language client.
+        voice = counter_client(shared, turn._replace(sourceLanguage=turn.targetLanguage), separateStages)
+        timed(recorder, "tts", voice.tts, translation)
+    else:
+        timed(recorder, "speech_turn", client.speech_turn, vad.audio)
+
+
+def run_counter(index, recorder, shared, turns, thinkSeconds, deadline, separateStages, seed) -> None:
+    rng = random.Random(seed * 7919 + index)
+    position = index
+    # Counters open at different times instead of all at once.
+    time.sleep(rng.uniform(0, thinkSeconds))
+    while time.monotonic() < deadline:
+        turn = turns[position % len(turns)]
+        position += 1
+        started = time.perf_counter()
+        try:
+            play_turn(recorder, shared, turn, separateStages)
+        except StageFailed:
+            pass
+        except Exception as error:
+            recorder.error("turn", error)
+        else:
+            recorder.stage("turn", time.perf_counter() - started)
+            recorder.done()
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(min(remaining, rng.expovariate(1.0 / thinkSeconds) if thinkSeconds > 0 else 0))
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_mock(args):
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "bhashini_translator.mock_server",
+            "--port",
+            str(port),
+            "--latency",
+            str(args.mock_latency),
+            "--jitter",
+            str(args.mock_jitter),
+            "--error-rate",
+            str(args.mock_error_rate),
+            "--seed",
+            str(args.seed),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process, f"http://127.0.0.1:{port}/ulca/apis/v0/model/getModelsPipeline"
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Mock server did not start")
+
+
+def peak_rss_bytes(usage) -> int:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+def run(args, ulcaEndPoint, turns) -> dict:
+    os.environ.setdefault("userID", "loadgen")
+    os.environ.setdefault("ulcaApiKey", "loadgen")
+    if args.rate_limits:
+        apiLimiter = ApiLimiter()
+    else:
+        unlimited = (1e9, 1e9)
+        apiLimiter = ApiLimiter(budgets={"config": unlimited, "inference": unlimited})
+    shared = Shared(
+        ulcaEndPoint=ulcaEndPoint,
+        configCache=ConfigCache(),
+        transport=Transport(poolMaxSize=max(16, args.counters)),
+        resilience=Resilience(),
+        apiLimiter=apiLimiter,
+        serviceSelector=ServiceSelector(),
+        scheduler=Scheduler(),
+    )
+    recorder = Recorder()
+    usageBefore = resource.getrusage(resource.RUSAGE_SELF)
+    started = time.monotonic()
+    deadline = started + args.duration
+    counters = [
+        threading.Thread(
+            target=run_counter,
+            args=(index, recorder, shared, turns, args.think, deadline, args.separate_stages, args.seed),
+            name=f"counter-{index}",
+            daemon=True,
+        )
+        for index in range(args.counters)
+    ]
+    for counter in counters:
+        counter.start()
+    for counter in counters:
+        counter.join()
+    elapsed = time.monotonic() - started
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    cpuSeconds = (usage.ru_utime - usageBefore.ru_utime) + (usage.ru_stime - usageBefore.ru_stime)
+    completed = recorder.completed
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "endpoint": ulcaEndPoint,
+            "counters": args.counters,
+            "thinkSeconds": args.think,
+            "durationSeconds": args.duration,
+            "corpusTurns": len(turns),
+            "separateStages": args.separate_stages,
+            "cpuCount": os.cpu_count(),
+        },
+        "throughput": {
+            "turns": completed,
+            "failedTurns": sum(recorder.errors.values()),
+            "elapsedSeconds": elapsed,
+            "turnsPerSecond": completed / elapsed,
+        },
+        "latency": recorder.latencies(),
+        "client": {
+            "cpuSeconds": cpuSeconds,
+            "cpuCoresUsed": cpuSeconds / elapsed,
+            "cpuMsPerTurn": cpuSeconds * 1000 / completed if completed else None,
+            "peakRssBytes": peak_rss_bytes(usage),
+            # Counters one core could keep up with at this turn rate, from CPU alone.
+            "countersPerCore": args.counters * elapsed / cpuSeconds if cpuSeconds else None,
+        },
+        "errors": dict(recorder.errors.most_common()),
+        "retries": shared.resilience.stats(),
+        "scheduler": shared.scheduler.stats(),
+    }
+
+
+def summary(report) -> str:
+    throughput, client = report["throughput"], report["client"]
+    lines = [
+        f"{report['meta']['counters']} counters, {throughput['turns']} turns in {throughput['elapsedSeconds']:.1f}s "
+        f"({throughput['turnsPerSecond']:.2f} turns/s), {throughput['failedTurns']} failed",
+        f"client CPU {client['cpuCoresUsed']:.2f} cores, peak RSS {client['peakRssBytes'] / 2**20:.0f} MiB",
+    ]
+    if client["countersPerCore"]:
+        lines[-1] += f", about {client['countersPerCore']:.0f} counters per core"
+    for stage, stats in report["latency"].items():
+        lines.append(
+            f"  {stage:<12} n={stats['count']:<6} p50 {stats['p50Ms']:8.1f} ms  "
+            f"p95 {stats['p95Ms']:8.1f} ms  p99 {stats['p99Ms']:8.1f} ms"
+        )
+    for kind, count in report["errors"].items():
+        lines.append(f"  error {kind}: {count}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadgen")
+    parser.add_argument("--counters", type=int, default=10, help="concurrent counters to simulate")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--think", type=float, default=3.0, help="mean think time between turns, in seconds")
+    parser.add_argument("--corpus", help="JSONL file of recorded turns (default: synthetic turns)")
+    parser.add_argument("--endpoint", help="ULCA config endpoint (default: a local mock server)")
+    parser.add_argument("--separate-stages", action="store_true", help="run ASR, NMT and TTS as separate calls")
+    parser.add_argument("--rate-limits", action="store_true", help="apply the configured API rate limits")
+    parser.add_argument("--mock-latency", type=float, default=0.3, help="mock seconds per task")
+    parser.add_argument("--mock-jitter", type=float, default=0.2)
+    parser.add_argument("--mock-error-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+    turns = load_corpus(args.corpus) if args.corpus else synthetic_corpus(seed=args.seed)
+    process = None
+    ulcaEndPoint = args.endpoint
+    if ulcaEndPoint is None:
+        process, ulcaEndPoint = start_mock(args)
+    try:
+        report = run(args, ulcaEndPoint, turns)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    print(summary(report), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
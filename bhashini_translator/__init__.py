@@ -1,4 +1,18 @@
-from .bhashini_translator import Bhashini
+from .async_bhashini import AsyncBhashini
+from .audio_cache import AudioCache, get_default_audio_cache
+from .audio_codec import AudioCodec, get_default_audio_codec
+from .bhashini_translator import Bhashini, client_for
 from .config import ulcaEndPoint
+from .config_cache import ConfigCache, get_default_config_cache
+from .errors import BhashiniAPIError, CircuitOpenError, RateLimitedError
 from .payloads import Payloads
-from .pipeline_config import PipelineConfig
+from .pipeline_config import PipelineConfig, ResolvedPipeline
+from .ratelimit import ApiLimiter, CircuitBreaker, TokenBucket, get_default_api_limiter
+from .resilience import Resilience, RetryPolicy, get_default_resilience
+from .results import Broadcast, BroadcastResult, SpeechTurn
+from .scheduler import BATCH, INTERACTIVE, Scheduler, get_default_scheduler, lane
+from .service_selector import ServiceSelector, get_default_service_selector
+from .single_flight import SingleFlight, get_default_single_flight
+from .translation_memory import TranslationMemory, get_default_translation_memory
+from .transport import Transport, get_default_transport
+from .warmup import Warmup, warm_up
@@ -0,0 +1,50 @@
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+from bhashini_translator.service_selector import ServiceSelector
+
+
+def scoreboard(path) -> int:
+    if not path or not os.path.exists(path):
+        print("No service stats found. Set ServiceStatsFile (or pass --file) and make some calls first.")
+        return 1
+    rows = ServiceSelector(path=path).scoreboard()
+    header = ("chain", "task", "source", "target", "serviceId", "calls", "errors", "errorRate", "latency")
+    table = [header]
+    for row in rows:
+        chain, taskType, sourceLanguage, targetLanguage, serviceId = row["key"]
+        latency = f"{row['latency'] * 1000:.0f} ms" if row["latency"] is not None else "-"
+        table.append(
+            (
+                chain,
+                taskType,
+                sourceLanguage or "-",
+                targetLanguage or "-",
+                serviceId,
+                str(row["calls"]),
+                str(row["errors"]),
+                f"{row['errorRate']:.0%}",
+                latency,
+            )
+        )
+    widths = [max(len(str(line[column])) for line in table) for column in range(len(header))]
+    for line in table:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(line, widths)))
+    return 0
+
+
+def main(argv=None) -> int:
+    load_dotenv()
+    parser = argparse.ArgumentParser(prog="python -m bhashini_translator")
+    commands = parser.add_subparsers(dest="command", required=True)
+    board = commands.add_parser("scoreboard", help="show latency and error rate of every service used")
+    board.add_argument("--file", default=os.environ.get("ServiceStatsFile"), help="service stats JSON file")
+    args = parser.parse_args(argv)
+    if args.command == "scoreboard":
+        return scoreboard(args.file)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
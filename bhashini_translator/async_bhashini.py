@@ -0,0 +1,276 @@
+import asyncio
+import json
+import os
+import time
+from bhashini_translator.config import (
+    ulcaEndPoint,
+    configRetryStatusCodes,
+    connectTimeout,
+    readTimeout,
+    poolMaxSize,
+)
+from bhashini_translator.config_cache import ConfigCache, get_default_config_cache
+from bhashini_translator.errors import BhashiniAPIError
+from bhashini_translator.payloads import Payloads
+from bhashini_translator.pipeline_config import ResolvedPipeline
+from bhashini_translator.ratelimit import ApiLimiter, get_default_api_limiter
+from bhashini_translator.results import SpeechTurn
+from bhashini_translator.single_flight import SingleFlight, flight_key, get_default_single_flight
+from bhashini_translator.translation_memory import TranslationMemory, get_default_translation_memory
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncBhashini(Payloads):
+    """
+    asyncio counterpart of Bhashini built on aiohttp.
+
+    Payloads are built by the same Payloads builders as the sync client;
+    only config resolution and inference calls are awaited. Every call
+    accepts a `deadline` in seconds (falling back to the client default)
+    and can be cancelled like any other task, which also aborts its HTTP
+    request. Resolved configs are passed along per call rather than kept
+    on the instance, so one client can serve many concurrent coroutines.
+    """
+
+    ulcaUserId: str
+    ulcaApiKey: str
+    sourceLanguage: str
+    targetLanguage: str
+    pipeLineId: str
+    ulcaEndPoint: str
+    configCache: ConfigCache
+    translationMemory: TranslationMemory
+    apiLimiter: ApiLimiter
+    singleFlight: SingleFlight
+
+    def __init__(
+        self,
+        sourceLanguage=None,
+        targetLanguage=None,
+        configCache=None,
+        session=None,
+        ulcaEndPoint=ulcaEndPoint,
+        connectTimeout=connectTimeout,
+        readTimeout=readTimeout,
+        poolMaxSize=poolMaxSize,
+        deadline=None,
+        translationMemory=None,
+        apiLimiter=None,
+        singleFlight=None,
+        serviceSelector=None,
+    ) -> None:
+        if aiohttp is None:
+            raise ImportError("AsyncBhashini requires aiohttp: pip install aiohttp")
+        self.ulcaUserId = os.environ.get("userID")
+        self.ulcaApiKey = os.environ.get("ulcaApiKey")
+        self.pipeLineId = os.environ.get("DefaultPipeLineId")
+        if not self.pipeLineId:
+            self.pipeLineId = "64392f96daac500b55c543cd"
+        self.ulcaEndPoint = ulcaEndPoint
+        if not self.ulcaUserId or not self.ulcaApiKey:
+            raise ValueError("Invalid Credentials!")
+        self.sourceLanguage = sourceLanguage
+        self.targetLanguage = targetLanguage
+        self.configCache = configCache if configCache is not None else get_default_config_cache()
+        self.translationMemory = (
+            translationMemory if translationMemory is not None else get_default_translation_memory()
+        )
+        self.apiLimiter = apiLimiter if apiLimiter is not None else get_default_api_limiter()
+        self.singleFlight = singleFlight if singleFlight is not None else get_default_single_flight()
+        self.serviceSelector = serviceSelector
+        self.connectTimeout = connectTimeout
+        self.readTimeout = readTimeout
+        self.poolMaxSize = poolMaxSize
+        self.deadline = deadline
+        self.session = session
+        self.ownsSession = session is None
+        self.pendingConfigs = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self) -> None:
+        if self.session is not None and self.ownsSession:
+            await self.session.close()
+            self.session = None
+
+    def get_session(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.poolMaxSize),
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=self.connectTimeout,
+                    sock_read=self.readTimeout,
+                ),
+            )
+        return self.session
+
+    async def memory_call(self, method, *args):
+        """
+        Call a translation memory method, in a worker thread when the
+        memory is backed by SQLite so its disk reads and writes do not
+        block the event loop.
+        """
+        call = getattr(self.translationMemory, method)
+        if self.translationMemory.path:
+            return await asyncio.to_thread(call, *args)
+        return call(*args)
+
+    async def translate(self, text, deadline=None) -> str:
+        remembered = await self.memory_call("get", self.sourceLanguage, self.targetLanguage, text)
+        if remembered is not None:
+            return remembered
+        pipelineResponse = await self.run_pipeline(self.nmt_payload, ["translation"], text, deadline)
+        target = pipelineResponse.get("pipelineResponse")[0].get("output")[0].get("target")
+        await self.memory_call("put", self.sourceLanguage, self.targetLanguage, text, target)
+        return target
+
+    async def tts(self, text, deadline=None) -> str:
+        pipelineResponse = await self.run_pipeline(self.tts_payload, ["tts"], text, deadline)
+        return pipelineResponse.get("pipelineResponse")[0].get("audio")[0].get("audioContent")
+
+    async def translate_batch(self, texts, maxBatchSize=None, maxBatchBytes=None, deadline=None) -> list:
+        texts = list(texts)
+        targets = await self.memory_call("get_many", self.sourceLanguage, self.targetLanguage, texts)
+        pending = [text for text, target in zip(texts, targets) if target is None]
+        batches = list(self.batches(pending, maxBatchSize, maxBatchBytes))
+        responses = await asyncio.gather(
+            *[self.run_pipeline(self.nmt_batch_payload, ["translation"], batch, deadline) for batch in batches]
+        )
+        translated = []
+        for batch, pipelineResponse in zip(batches, responses):
+            output = pipelineResponse.get("pipelineResponse")[0].get("output")
+            translated.extend(item.get("target") for item in self.check_batch(batch, output))
+        return await self.memory_call("merge", self.sourceLanguage, self.targetLanguage, texts, targets, translated)
+
+    async def tts_batch(self, texts, maxBatchSize=None, maxBatchBytes=None, deadline=None) -> list:
+        batches = list(self.batches(texts, maxBatchSize, maxBatchBytes))
+        responses = await asyncio.gather(
+            *[self.run_pipeline(self.tts_batch_payload, ["tts"], batch, deadline) for batch in batches]
+        )
+        audioContents = []
+        for batch, pipelineResponse in zip(batches, responses):
+            audio = pipelineResponse.get("pipelineResponse")[0].get("audio")
+            audioContents.extend(item.get("audioContent") for item in self.check_batch(batch, audio))
+        return audioContents
+
+    async def asr(self, base64String: str, deadline=None) -> str:
+        pipelineResponse = await self.run_pipeline(self.asr_payload, ["asr"], base64String, deadline)
+        return pipelineResponse.get("pipelineResponse")[0].get("output")[0].get("source")
+
+    async def asr_nmt(self, base64String: str, deadline=None) -> str:
+        pipelineResponse = await self.run_pipeline(
+            self.asr_nmt_payload, ["asr", "translation"], base64String, deadline
+        )
+        transcript = pipelineResponse.get("pipelineResponse")[0].get("output")[0].get("source")
+        target = pipelineResponse.get("pipelineResponse")[1].get("output")[0].get("target")
+        await self.memory_call("put", self.sourceLanguage, self.targetLanguage, transcript, target)
+        return target
+
+    async def nmt_tts(self, text: str, deadline=None) -> str:
+        pipelineResponse = await self.run_pipeline(
+            self.nmt_tts_payload, ["translation", "tts"], text, deadline
+        )
+        return pipelineResponse.get("pipelineResponse")[1].get("audio")[0].get("audioContent")
+
+    async def asr_nmt_tts(self, base64String: str, deadline=None) -> str:
+        pipelineResponse = await self.run_pipeline(
+            self.asr_nmt_tts_payload, ["asr", "translation", "tts"], base64String, deadline
+        )
+        return pipelineResponse.get("pipelineResponse")[2].get("audio")[0].get("audioContent")
+
+    async def speech_turn(self, base64String, deadline=None) -> SpeechTurn:
+        pipelineResponse = await self.run_pipeline(
+            self.asr_nmt_tts_payload, ["asr", "translation", "tts"], base64String, deadline
+        )
+        turn = SpeechTurn.from_response(pipelineResponse)
+        await self.memory_call("put", self.sourceLanguage, self.targetLanguage, turn.transcript, turn.translation)
+        return turn
+
+    async def resolve_configs(self, taskTypes):
+        """
+        Resolve a task chain, fetching uncached tasks in one request.
+        Returns a ResolvedPipeline for this call only.
+        """
+        taskTypeConfigs, cacheKeys, entries = self.lookupPipeLineConfigs(taskTypes)
+        missing = [index for index, entry in enumerate(entries) if entry is None]
+        fetched = None
+        if missing:
+            # Concurrent cold calls for the same chain share one config request.
+            pendingKey = tuple(cacheKeys[index] for index in missing)
+            pending = self.pendingConfigs.get(pendingKey)
+            if pending is None:
+                pending = asyncio.ensure_future(
+                    self.fetch_pipeline_config([taskTypeConfigs[index] for index in missing])
+                )
+                self.pendingConfigs[pendingKey] = pending
+                pending.add_done_callback(lambda _: self.pendingConfigs.pop(pendingKey, None))
+            fetched = await asyncio.shield(pending)
+        pipeLineData = self.applyPipeLineConfigs(taskTypeConfigs, cacheKeys, entries, fetched)
+        return self.resolvedPipeLine(taskTypeConfigs, pipeLineData, cacheKeys)
+
+    async def fetch_pipeline_config(self, taskTypeConfigs) -> dict:
+        payload, headers = self.configRequest(taskTypeConfigs)
+        await self.apiLimiter.before_async("config")
+        try:
+            async with self.get_session().post(self.ulcaEndPoint, data=payload, headers=headers) as response:
+                text = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.apiLimiter.after("config")
+            raise
+        except BaseException:
+            # Cancelled by a deadline or by the caller; the outcome is unknown.
+            self.apiLimiter.cancel("config")
+            raise
+        self.apiLimiter.after("config", response.status)
+        if response.status != 200:
+            raise self.configError(response.status, text)
+        return json.loads(text)
+
+    async def run_pipeline(self, buildPayload, taskTypes, data, deadline=None) -> dict:
+        deadline = deadline if deadline is not None else self.deadline
+        key = flight_key(
+            self.ulcaEndPoint, self.pipeLineId, self.sourceLanguage, self.targetLanguage, taskTypes, data
+        )
+        return await self.singleFlight.do_async(
+            key, lambda: self.resolve_and_compute(buildPayload, taskTypes, data), deadline
+        )
+
+    async def resolve_and_compute(self, buildPayload, taskTypes, data) -> dict:
+        pipeline = await self.resolve_configs(taskTypes)
+        try:
+            return await self.compute_response(buildPayload(data, pipelineTasks=list(pipeline.pipelineTasks)), pipeline)
+        except BhashiniAPIError as error:
+            if error.statusCode not in configRetryStatusCodes:
+                raise
+            self.configCache.invalidate(*pipeline.cacheKeys)
+        pipeline = await self.resolve_configs(taskTypes)
+        return await self.compute_response(buildPayload(data, pipelineTasks=list(pipeline.pipelineTasks)), pipeline)
+
+    async def compute_response(self, requestPayload: str, pipeline: ResolvedPipeline) -> dict:
+        await self.apiLimiter.before_async("inference")
+        started = time.perf_counter()
+        try:
+            session = self.get_session()
+            async with session.post(pipeline.callbackUrl, data=requestPayload, headers=pipeline.headers) as response:
+                text = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.apiLimiter.after("inference")
+            self.selector().record(pipeline.taskKey, pipeline.pipelineTasks, None, False)
+            raise
+        except BaseException:
+            self.apiLimiter.cancel("inference")
+            raise
+        self.apiLimiter.after("inference", response.status)
+        seconds = time.perf_counter() - started
+        self.selector().record(pipeline.taskKey, pipeline.pipelineTasks, seconds, response.status == 200)
+        if response.status != 200:
+            raise BhashiniAPIError("Something went wrong", response.status, text)
+        return json.loads(text)
@@ -0,0 +1,175 @@
+import struct
+from typing import NamedTuple
+import numpy as np
+from bhashini_translator.config import asrSampleRate
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class WavAudio(NamedTuple):
+    samples: np.ndarray  # float32, shape (frames, channels), in [-1, 1]
+    sampleRate: int
+    bitsPerSample: int
+
+    @property
+    def channels(self) -> int:
+        return self.samples.shape[1]
+
+    @property
+    def durationSeconds(self) -> float:
+        return len(self.samples) / self.sampleRate if self.sampleRate else 0.0
+
+
+class NormalizedAudio(NamedTuple):
+    audio: bytes
+    sampleRate: int
+    durationSeconds: float
+    originalBytes: int
+
+
+def read_wav_header(wavBytes):
+    """
+    Walk the RIFF chunks of a WAV file. Returns the format tag, channel
+    count, sample rate, bits per sample and the offset and length of the
+    data chunk. A fmt chunk with no channels or under 8 bits per sample
+    raises ValueError. Browser recorders sometimes leave the data size at 0 or
+    0xFFFFFFFF, so the length is clamped to the bytes actually present.
+    """
+    view = memoryview(wavBytes)
+    if len(view) < 12 or bytes(view[0:4]) != b"RIFF" or bytes(view[8:12]) != b"WAVE":
+        raise ValueError("Not a RIFF/WAVE file")
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(view):
+        chunkId = bytes(view[offset : offset + 4])
+        (chunkSize,) = struct.unpack_from("<I", view, offset + 4)
+        body = offset + 8
+        if chunkId == b"fmt ":
+            if body + 16 > len(view):
+                raise ValueError("WAV fmt chunk is truncated")
+            formatTag, channels, sampleRate, _, _, bitsPerSample = struct.unpack_from("<HHIIHH", view, body)
+            if channels < 1:
+                raise ValueError("WAV file declares no channels")
+            if bitsPerSample < 8:
+                raise ValueError(f"WAV file declares {bitsPerSample} bits per sample")
+            if formatTag == WAVE_FORMAT_EXTENSIBLE and chunkSize >= 40:
+                (formatTag,) = struct.unpack_from("<H", view, body + 24)
+            fmt = (formatTag, channels, sampleRate, bitsPerSample)
+        elif chunkId == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk precedes its fmt chunk")
+            available = len(view) - body
+            if chunkSize == 0 or chunkSize > available:
+                chunkSize = available
+            return (*fmt, body, chunkSize)
+        offset = body + chunkSize + (chunkSize & 1)
+    raise ValueError("WAV file has no data chunk")
+
+
+def parse_wav(wavBytes) -> WavAudio:
+    """
+    Decode PCM (8/16/24/32-bit) or IEEE float WAV data into float32 samples.
+    """
+    formatTag, channels, sampleRate, bitsPerSample, offset, length = read_wav_header(wavBytes)
+    sampleWidth = bitsPerSample // 8
+    frameSize = sampleWidth * channels
+    raw = np.frombuffer(wavBytes, dtype=np.uint8, count=length - length % frameSize, offset=offset)
+    if formatTag == WAVE_FORMAT_IEEE_FLOAT and sampleWidth in (4, 8):
+        samples = raw.view("<f4" if sampleWidth == 4 else "<f8").astype(np.float32)
+    elif formatTag == WAVE_FORMAT_PCM and sampleWidth == 1:
+        samples = (raw.astype(np.float32) - 128.0) / 128.0
+    elif formatTag == WAVE_FORMAT_PCM and sampleWidth in (2, 4):
+        samples = raw.view("<i2" if sampleWidth == 2 else "<i4").astype(np.float32)
+        samples /= float(2 ** (bitsPerSample - 1))
+    elif formatTag == WAVE_FORMAT_PCM and sampleWidth == 3:
+        triples = raw.reshape(-1, 3).astype(np.int32)
+        values = triples[:, 0] | (triples[:, 1] << 8) | (triples[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        samples = values.astype(np.float32) / float(2**23)
+    else:
+        raise ValueError(f"Unsupported WAV encoding: format {formatTag:#06x}, {bitsPerSample} bits")
+    return WavAudio(samples.reshape(-1, channels), sampleRate, bitsPerSample)
+
+
+def wav_duration(wavBytes) -> float:
+    """
+    Exact duration in seconds, read from the header without decoding samples.
+    """
+    _, channels, sampleRate, bitsPerSample, _, length = read_wav_header(wavBytes)
+    frameSize = bitsPerSample // 8 * channels
+    return (length // frameSize) / sampleRate if sampleRate else 0.0
+
+
+def to_mono(samples) -> np.ndarray:
+    return samples.mean(axis=1) if samples.ndim == 2 else samples
+
+
+def resample(samples, fromRate, toRate, taps=63) -> np.ndarray:
+    """
+    Resample mono samples. Downsampling first applies a Hann-windowed sinc
+    low-pass at the new Nyquist frequency to avoid aliasing; the output is
+    then read off by linear interpolation.
+    """
+    if fromRate == toRate or len(samples) == 0:
+        return samples.astype(np.float32, copy=False)
+    if toRate < fromRate:
+        cutoff = toRate / fromRate / 2
+        n = np.arange(taps) - (taps - 1) / 2
+        kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hanning(taps)
+        samples = np.convolve(samples, kernel / kernel.sum(), mode="same")
+    outputLength = int(round(len(samples) * toRate / fromRate))
+    positions = np.arange(outputLength) * (fromRate / toRate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def encode_wav(samples, sampleRate) -> bytes:
+    """
+    Encode float samples, mono or shaped (frames, channels), as 16-bit PCM WAV.
+    """
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).round().astype("<i2").tobytes()
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + len(pcm),
+        b"WAVE",
+        b"fmt ",
+        16,
+        WAVE_FORMAT_PCM,
+        channels,
+        sampleRate,
+        sampleRate * channels * 2,
+        channels * 2,
+        16,
+        b"data",
+        len(pcm),
+    )
+    return header + pcm
+
+
+def normalize_for_asr(wavBytes, sampleRate=asrSampleRate) -> NormalizedAudio:
+    """
+    Downmix to mono, resample to the ASR rate and re-encode as 16-bit PCM.
+    Audio that is already in that format is passed through untouched.
+    """
+    formatTag, channels, rate, bitsPerSample, _, _ = read_wav_header(wavBytes)
+    if formatTag == WAVE_FORMAT_PCM and channels == 1 and rate == sampleRate and bitsPerSample == 16:
+        return NormalizedAudio(bytes(wavBytes), sampleRate, wav_duration(wavBytes), len(wavBytes))
+    wav = parse_wav(wavBytes)
+    samples = resample(to_mono(wav.samples), wav.sampleRate, sampleRate)
+    return NormalizedAudio(encode_wav(samples, sampleRate), sampleRate, wav.durationSeconds, len(wavBytes))
+
+
+def join_wav(wavs) -> bytes:
+    """
+    Concatenate WAV clips into one 16-bit PCM WAV. Clips are downmixed to
+    mono and resampled to the rate of the first clip when they differ.
+    """
+    clips = [parse_wav(wav) for wav in wavs]
+    if not clips:
+        raise ValueError("No audio to join")
+    sampleRate = clips[0].sampleRate
+    samples = [resample(to_mono(clip.samples), clip.sampleRate, sampleRate) for clip in clips]
+    return encode_wav(np.concatenate(samples), sampleRate)
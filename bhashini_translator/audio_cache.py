@@ -0,0 +1,129 @@
+import hashlib
+import mmap
+import os
+import threading
+from bhashini_translator.config import audioCacheLowWater, audioCacheMaxBytes
+
+
+class AudioCache:
+    """
+    Content-addressed disk cache of synthesized speech.
+
+    Clips are stored as raw WAV (not base64) under a hash of
+    (language, gender, serviceId, text). Hits are served as a memoryview
+    over a read-only memory map of the file, so playing a cached clip does
+    not copy it into the Python heap. Once the directory holds more than
+    `maxBytes`, the least recently used clips are deleted until it is back
+    under `lowWater` of that, so the directory is rescanned only once every
+    so many puts rather than on each one.
+    """
+
+    def __init__(self, directory, maxBytes=audioCacheMaxBytes, lowWater=audioCacheLowWater):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.lowWater = lowWater
+        self.lock = threading.Lock()
+        self.evictLock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self.totalBytes = sum(size for _, size, _ in self.files())
+
+    @staticmethod
+    def key(language, gender, serviceId, text) -> str:
+        textHash = hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{language}\0{gender}\0{serviceId}\0{textHash}".encode("utf-8")).hexdigest()
+
+    def path(self, key) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.wav")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        return memoryview(mapped)
+
+    def put(self, key, wavBytes) -> memoryview:
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmpPath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmpPath, "wb") as f:
+            f.write(wavBytes)
+        try:
+            previous = os.path.getsize(path)
+        except OSError:
+            previous = 0
+        os.replace(tmpPath, path)
+        with self.lock:
+            self.totalBytes += len(wavBytes) - previous
+            overBudget = self.totalBytes > self.maxBytes
+        if overBudget:
+            self.evict()
+        return memoryview(wavBytes)
+
+    def files(self):
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".wav"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def evict(self) -> None:
+        """
+        Delete least recently used clips until the cache fits in lowWater
+        of maxBytes. A put arriving while another thread evicts skips it.
+        """
+        if not self.evictLock.acquire(blocking=False):
+            return
+        try:
+            files = sorted(self.files(), key=lambda item: item[2])
+            totalBytes = sum(size for _, size, _ in files)
+            target = self.maxBytes * self.lowWater
+            for path, size, _ in files:
+                if totalBytes <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                totalBytes -= size
+            with self.lock:
+                self.totalBytes = totalBytes
+        finally:
+            self.evictLock.release()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "totalBytes": self.totalBytes}
+
+
+_defaultAudioCache = None
+_defaultAudioCacheLock = threading.Lock()
+
+
+def get_default_audio_cache():
+    """
+    Process-wide audio cache, enabled by setting AudioCacheDir in the
+    environment. Returns None when it is not configured.
+    """
+    global _defaultAudioCache
+    directory = os.environ.get("AudioCacheDir")
+    if not directory:
+        return None
+    with _defaultAudioCacheLock:
+        if _defaultAudioCache is None:
+            _defaultAudioCache = AudioCache(directory)
+        return _defaultAudioCache
@@ -0,0 +1,141 @@
+import base64
+import io
+import os
+import threading
+from collections import defaultdict
+from bhashini_translator.config import asrAudioFormat, ttsAudioFormat
+from bhashini_translator.request_body import base64_length
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+# audioFormat values the service understands, mapped to soundfile (format, subtype).
+_soundfileFormats = {"flac": ("FLAC", "PCM_16"), "ogg": ("OGG", "OPUS")}
+
+
+class AudioCodec:
+    """
+    Negotiates compressed audio on the wire. ASR input is sent as
+    `asrFormat`, and TTS output is requested as `ttsFormat`. Both are
+    converted locally, so callers still pass and receive WAV. "flac" is
+    lossless and "ogg" is Ogg Opus.
+
+    Compression needs the optional soundfile package. Without it, or when
+    the service rejects a format, that format falls back to "wav" for the
+    rest of the process. Bytes before and after encoding are counted per
+    direction and format.
+    """
+
+    def __init__(self, asrFormat=asrAudioFormat, ttsFormat=ttsAudioFormat):
+        self.asrFormat = self.usable(asrFormat)
+        self.ttsFormat = self.usable(ttsFormat)
+        self.rejected = set()
+        self.counters = defaultdict(lambda: defaultdict(int))
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def usable(audioFormat) -> str:
+        if audioFormat not in _soundfileFormats or soundfile is None:
+            return "wav"
+        fileFormat, subtype = _soundfileFormats[audioFormat]
+        return audioFormat if subtype in soundfile.available_subtypes(fileFormat) else "wav"
+
+    def formats(self, taskTypes, streaming=False) -> dict:
+        """
+        Compressed formats to use for a task chain, by task type. Streamed
+        TTS is always WAV because it is decoded straight into the sink.
+        """
+        formats = {}
+        if "asr" in taskTypes and self.asrFormat != "wav" and ("asr", self.asrFormat) not in self.rejected:
+            formats["asr"] = self.asrFormat
+        if "tts" in taskTypes and not streaming and self.ttsFormat != "wav" and ("tts", self.ttsFormat) not in self.rejected:
+            formats["tts"] = self.ttsFormat
+        return formats
+
+    def reject(self, formats) -> None:
+        with self.lock:
+            self.rejected.update(formats.items())
+
+    @staticmethod
+    def apply(pipelineTasks, formats) -> list:
+        """
+        Copies of the task configs with audioFormat set where one is negotiated.
+        """
+        if not formats:
+            return pipelineTasks
+        stamped = []
+        for taskTypeConfig in pipelineTasks:
+            audioFormat = formats.get(taskTypeConfig["taskType"])
+            if audioFormat is not None:
+                config = dict(taskTypeConfig["config"], audioFormat=audioFormat)
+                taskTypeConfig = dict(taskTypeConfig, config=config)
+            stamped.append(taskTypeConfig)
+        return stamped
+
+    def encode(self, audio, audioFormat) -> bytes:
+        """
+        Re-encode WAV (raw bytes or a base64 string) for upload.
+        """
+        # numpy is only needed once compression is in use.
+        from bhashini_translator.audio import parse_wav, to_mono
+
+        wavBytes = base64.b64decode(audio) if isinstance(audio, str) else bytes(audio)
+        wav = parse_wav(wavBytes)
+        fileFormat, subtype = _soundfileFormats[audioFormat]
+        buffer = io.BytesIO()
+        soundfile.write(buffer, to_mono(wav.samples), wav.sampleRate, format=fileFormat, subtype=subtype)
+        encoded = buffer.getvalue()
+        self.record("asr", audioFormat, len(wavBytes), len(encoded))
+        return encoded
+
+    def decode(self, audioContent, audioFormat) -> str:
+        """
+        Turn base64 audio downloaded as audioFormat back into base64 WAV.
+        """
+        from bhashini_translator.audio import encode_wav
+
+        compressed = base64.b64decode(audioContent)
+        samples, sampleRate = soundfile.read(io.BytesIO(compressed), dtype="float32")
+        wavBytes = encode_wav(samples, sampleRate)
+        self.record("tts", audioFormat, len(wavBytes), len(compressed))
+        return base64.b64encode(wavBytes).decode("utf-8")
+
+    def record_wav(self, direction, size) -> None:
+        self.record(direction, "wav", size, size)
+
+    def record(self, direction, audioFormat, wavBytes, wireBytes) -> None:
+        with self.lock:
+            counters = self.counters[(direction, audioFormat)]
+            counters["clips"] += 1
+            counters["wavBytes"] += base64_length(wavBytes)
+            counters["wireBytes"] += base64_length(wireBytes)
+
+    def stats(self) -> dict:
+        """
+        Base64 bytes that WAV would have needed and that were actually
+        sent, keyed by "direction/format".
+        """
+        with self.lock:
+            return {f"{direction}/{audioFormat}": dict(counters) for (direction, audioFormat), counters in self.counters.items()}
+
+
+_defaultAudioCodec = None
+_defaultAudioCodecLock = threading.Lock()
+
+
+def get_default_audio_codec() -> AudioCodec:
+    """
+    Process-wide codec shared by every Bhashini instance. AsrAudioFormat and
+    TtsAudioFormat in the environment override the configured formats;
+    set either to "wav" to turn compression off.
+    """
+    global _defaultAudioCodec
+    with _defaultAudioCodecLock:
+        if _defaultAudioCodec is None:
+            _defaultAudioCodec = AudioCodec(
+                asrFormat=os.environ.get("AsrAudioFormat", asrAudioFormat),
+                ttsFormat=os.environ.get("TtsAudioFormat", ttsAudioFormat),
+            )
+        return _defaultAudioCodec
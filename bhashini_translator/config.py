@@ -1 +1,85 @@
 ulcaEndPoint = "https://meity-auth.ulcacontrib.org/ulca/apis/v0/model/getModelsPipeline"
+
+# Resolved pipeline configs (serviceId + inference endpoint) are reused for this many seconds.
+configCacheTtl = 6 * 60 * 60
+# Inference failures with these status codes invalidate the cached config and retry once.
+# 5xx is not among them: it means the service is struggling, not that the config is
+# stale, and the sync client already retries it with backoff (retryStatusCodes).
+configRetryStatusCodes = (401, 403, 404)
+
+# HTTP transport defaults, in seconds and connections per host.
+connectTimeout = 5
+readTimeout = 60
+poolConnections = 4
+poolMaxSize = 16
+# Request bodies smaller than this are never gzipped.
+gzipMinBytes = 1024
+
+# translate_batch / tts_batch pack at most this many inputs, or this many UTF-8 bytes, per request.
+maxBatchSize = 32
+maxBatchBytes = 16 * 1024
+
+# Translation memory: entries kept in the in-process LRU and in the SQLite store.
+translationMemoryLruSize = 2048
+translationMemoryMaxEntries = 100_000
+
+# Synthesized audio kept on disk is evicted, oldest first, beyond this many bytes.
+audioCacheMaxBytes = 512 * 1024 * 1024
+# Eviction trims the cache to this fraction of audioCacheMaxBytes, so the
+# next puts fit without rescanning the directory each time.
+audioCacheLowWater = 0.9
+
+# Audio is resampled to this rate (mono, 16-bit PCM) before ASR uploads.
+asrSampleRate = 16000
+
+# Raw audio is base64-encoded into request bodies this many bytes at a time (a multiple of 3).
+bodyChunkSize = 3 * 64 * 1024
+
+# Streamed responses are read from the socket this many bytes at a time.
+responseChunkSize = 64 * 1024
+
+# Sentences of a long utterance translated and synthesized in parallel.
+segmentWorkers = 4
+
+# Per-stage inference deadlines in seconds; a chained call gets the sum of its stages.
+stageDeadlines = {"asr": 20.0, "translation": 10.0, "tts": 20.0}
+# Inference responses with these status codes are retried with jittered backoff.
+retryStatusCodes = (429, 500, 502, 503, 504)
+
+# Token buckets shared by every client of the API key: (requests per second, burst).
+configRateLimit = (2.0, 5)
+inferenceRateLimit = (10.0, 20)
+# Calls wait at most this many seconds for a token before failing.
+rateLimitWait = 10.0
+# A budget's circuit opens after this many consecutive failures and is probed again after the reset timeout.
+breakerFailureThreshold = 5
+breakerResetTimeout = 30.0
+
+# Target languages of a broadcast translated and synthesized in parallel.
+broadcastWorkers = 4
+
+# Continuous capture: an utterance ends after this much silence, or at this length.
+utteranceSilenceMs = 700
+maxUtteranceSeconds = 15
+# Utterances processed in parallel while capture continues.
+captureWorkers = 2
+
+# Audio on the wire: "flac" (lossless) or "ogg" (Opus) when soundfile is installed, else "wav".
+asrAudioFormat = "flac"
+ttsAudioFormat = "ogg"
+# Inference responses with these status codes after a compressed request mean the format was rejected.
+formatRejectedStatusCodes = (400, 415, 422)
+
+# Service selection: EWMA weights of latency and error samples, calls before a service is
+# trusted, share of calls that try a random candidate, and error rate that rules a service out.
+serviceLatencyAlpha = 0.2
+serviceErrorAlpha = 0.1
+serviceMinSamples = 3
+serviceExploreRate = 0.05
+serviceMaxErrorRate = 0.5
+
+# Scheduler: inference calls in flight at once, the share of them batch work may use,
+# and how long a batch call waits before it competes with interactive calls.
+schedulerWorkers = 16
+schedulerBatchWorkers = 12
+schedulerAgingSeconds = 5.0
@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+import time
+from bhashini_translator.config import configCacheTtl
+
+
+class ConfigCache:
+    """
+    Caches resolved pipeline configs keyed by
+    (pipelineId, taskType, sourceLanguage, targetLanguage, gender).
+
+    Each entry holds the first serviceId, every candidate serviceId and the
+    pipelineInferenceAPIEndPoint
+    (callbackUrl and inferenceApiKey) returned by getModelsPipeline.
+    Entries expire after `ttl` seconds. When `path` is given the cache is
+    loaded from and written back to that JSON file, so a restarted process
+    starts warm.
+    """
+
+    def __init__(self, ttl=configCacheTtl, path=None):
+        self.ttl = ttl
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        # Bumped on every change; save() writes each version at most once,
+        # never after a newer one.
+        self.version = 0
+        self.savedVersion = 0
+        self.saveLock = threading.Lock()
+        if self.path:
+            self.load()
+
+    @staticmethod
+    def key(pipeLineId, taskTypeConfig) -> tuple:
+        config = taskTypeConfig.get("config", {})
+        language = config.get("language", {})
+        return (
+            pipeLineId,
+            taskTypeConfig.get("taskType"),
+            language.get("sourceLanguage"),
+            language.get("targetLanguage"),
+            config.get("gender"),
+        )
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry["expiresAt"] <= time.time():
+                del self.entries[key]
+                return None
+            return entry
+
+    def put(self, key, serviceId, pipelineInferenceAPIEndPoint, candidates=None) -> dict:
+        entry = {
+            "serviceId": serviceId,
+            "candidates": list(candidates or [serviceId]),
+            "pipelineInferenceAPIEndPoint": pipelineInferenceAPIEndPoint,
+            "expiresAt": time.time() + self.ttl,
+        }
+        with self.lock:
+            self.entries[key] = entry
+            self.version += 1
+        self.save()
+        return entry
+
+    def invalidate(self, *keys) -> None:
+        """
+        Drop the given keys, or every entry when called without arguments.
+        """
+        with self.lock:
+            if not keys:
+                self.entries.clear()
+            for key in keys:
+                self.entries.pop(key, None)
+            self.version += 1
+        self.save()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        with self.lock:
+            for item in stored:
+                if item.get("expiresAt", 0) > now:
+                    self.entries[tuple(item["key"])] = {
+                        "serviceId": item["serviceId"],
+                        "candidates": item.get("candidates") or [item["serviceId"]],
+                        "pipelineInferenceAPIEndPoint": item["pipelineInferenceAPIEndPoint"],
+                        "expiresAt": item["expiresAt"],
+                    }
+
+    def save(self) -> None:
+        """
+        Write the cache to path. Saves are serialized, so an older snapshot
+        never replaces a newer one, and a save whose change was already
+        written by another thread is skipped.
+        """
+        if not self.path:
+            return
+        with self.saveLock:
+            with self.lock:
+                if self.version == self.savedVersion:
+                    return
+                version = self.version
+                stored = [dict(entry, key=list(key)) for key, entry in self.entries.items()]
+            # The file holds inference API keys, so keep it private to the user.
+            tmpPath = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fd = os.open(tmpPath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(stored, f)
+            os.replace(tmpPath, self.path)
+            self.savedVersion = version
+
+
+_defaultConfigCache = None
+_defaultConfigCacheLock = threading.Lock()
+
+
+def get_default_config_cache() -> ConfigCache:
+    """
+    Process-wide cache shared by every Bhashini instance. Set ConfigCacheFile
+    in the environment to persist it, and ConfigCacheTtl to change the TTL.
+    """
+    global _defaultConfigCache
+    with _defaultConfigCacheLock:
+        if _defaultConfigCache is None:
+            _defaultConfigCache = ConfigCache(
+                ttl=float(os.environ.get("ConfigCacheTtl", configCacheTtl)),
+                path=os.environ.get("ConfigCacheFile"),
+            )
+        return _defaultConfigCache
@@ -0,0 +1,21 @@
+class BhashiniAPIError(ValueError):
+    """
+    Raised when a ULCA config or inference call returns a non-200 response.
+    """
+
+    def __init__(self, message, statusCode=None, responseText=None):
+        super().__init__(message)
+        self.statusCode = statusCode
+        self.responseText = responseText
+
+
+class RateLimitedError(BhashiniAPIError):
+    """
+    Raised when no request token became available within the wait budget.
+    """
+
+
+class CircuitOpenError(BhashiniAPIError):
+    """
+    Raised without calling the service while its circuit breaker is open.
+    """
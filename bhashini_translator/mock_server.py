@@ -0,0 +1,338 @@
+import argparse
+import array
+import base64
+import gzip
+import json
+import math
+import random
+import struct
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+configPath = "/ulca/apis/v0/model/getModelsPipeline"
+inferencePath = "/services/inference/pipeline"
+inferenceApiKey = "mock-inference-key"
+
+defaultTranscript = "I need one ticket to Delhi on the evening train."
+
+
+def tone_wav(seconds, sampleRate=22050, frequency=220.0) -> bytes:
+    """
+    A quiet sine tone as 16-bit mono WAV, built without numpy so the mock
+    runs on a bare interpreter.
+    """
+    frames = int(seconds * sampleRate)
+    step = 2 * math.pi * frequency / sampleRate
+    pcm = array.array("h", (int(3000 * math.sin(step * i)) for i in range(frames)))
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    data = pcm.tobytes()
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + len(data),
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        1,
+        sampleRate,
+        sampleRate * 2,
+        2,
+        16,
+        b"data",
+        len(data),
+    )
+    return header + data
+
+
+class MockBhashini:
+    """
+    Local stand-in for the ULCA config endpoint and the inference callback,
+    for benchmarks and load tests that must not touch the real service.
+
+    Each task in an inference chain takes `latency` seconds, plus up to
+    `jitter` more. Every task offers `servicesPerTask` serviceIds, and the
+    n-th one is `serviceSpread * n` seconds slower. A fraction `errorRate`
+    of inference calls fail with `errorStatus`, and a fraction
+    `configErrorRate` of config calls fail with 503.
+
+    ASR returns `transcript`, translation tags its input with the target
+    language, and TTS returns a tone whose length follows the text. Audio
+    always comes back as WAV, which the client's decoders read whatever
+    audioFormat was asked for. Gzip request bodies are accepted, as the
+    real service does. Replies to clients that already hung up are counted
+    as "abandoned".
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        jitter=0.0,
+        errorRate=0.0,
+        errorStatus=503,
+        configLatency=0.0,
+        configErrorRate=0.0,
+        servicesPerTask=2,
+        serviceSpread=0.0,
+        transcript=defaultTranscript,
+        seed=None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.errorRate = errorRate
+        self.errorStatus = errorStatus
+        self.configLatency = configLatency
+        self.configErrorRate = configErrorRate
+        self.servicesPerTask = servicesPerTask
+        self.serviceSpread = serviceSpread
+        self.transcript = transcript
+        self.random = random.Random(seed)
+        self.tones = {}
+        self.counters = defaultdict(int)
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.mock = self
+        self.thread = None
+
+    @property
+    def baseUrl(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def ulcaEndPoint(self) -> str:
+        """
+        Pass this as `ulcaEndPoint` to Bhashini or AsyncBhashini.
+        """
+        return self.baseUrl + configPath
+
+    def start(self) -> "MockBhashini":
+        self.thread = threading.Thread(target=self.server.serve_forever, name="bhashini-mock", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def count(self, name, amount=1) -> None:
+        with self.lock:
+            self.counters[name] += amount
+
+    def stats(self) -> dict:
+        with self.lock:
+            return dict(self.counters)
+
+    def chance(self, rate) -> bool:
+        with self.lock:
+            return self.random.random() < rate
+
+    def delay(self, pipelineTasks) -> float:
+        with self.lock:
+            seconds = 0.0
+            for taskTypeConfig in pipelineTasks:
+                seconds += self.latency + self.jitter * self.random.random()
+                serviceId = taskTypeConfig.get("config", {}).get("serviceId") or ""
+                index = serviceId.rpartition("-")[2]
+                seconds += self.serviceSpread * (int(index) if index.isdigit() else 0)
+        return seconds
+
+    def tone(self, text) -> str:
+        seconds = round(min(10.0, 0.2 + 0.06 * len(text)), 1)
+        with self.lock:
+            audioContent = self.tones.get(seconds)
+        if audioContent is None:
+            audioContent = base64.b64encode(tone_wav(seconds)).decode("utf-8")
+            with self.lock:
+                self.tones[seconds] = audioContent
+        return audioContent
+
+    def pipeline_config(self, request) -> dict:
+        pipelineResponseConfig = []
+        for taskTypeConfig in request["pipelineTasks"]:
+            taskType = taskTypeConfig["taskType"]
+            language = taskTypeConfig.get("config", {}).get("language", {})
+            pipelineResponseConfig.append(
+                {
+                    "taskType": taskType,
+                    "config": [
+                        {"serviceId": f"mock-{taskType}-{index}", "language": language}
+                        for index in range(self.servicesPerTask)
+                    ],
+                }
+            )
+        return {
+            "languages": [],
+            "pipelineResponseConfig": pipelineResponseConfig,
+            "pipelineInferenceAPIEndPoint": {
+                "callbackUrl": self.baseUrl + inferencePath,
+                "inferenceApiKey": {"name": "Authorization", "value": inferenceApiKey},
+            },
+        }
+
+    def inference(self, request) -> dict:
+        inputData = request["inputData"]
+        texts = [item["source"] for item in inputData.get("input", [])]
+        pipelineResponse = []
+        for taskTypeConfig in request["pipelineTasks"]:
+            taskType = taskTypeConfig["taskType"]
+            config = taskTypeConfig.get("config", {})
+            if taskType == "asr":
+                texts = [self.transcript for _ in inputData.get("audio", [])]
+                output = {"taskType": taskType, "output": [{"source": text} for text in texts]}
+            elif taskType == "translation":
+                targetLanguage = config.get("language", {}).get("targetLanguage")
+                output = {
+                    "taskType": taskType,
+                    "output": [{"source": text, "target": f"[{targetLanguage}] {text}"} for text in texts],
+                }
+                texts = [f"[{targetLanguage}] {text}" for text in texts]
+            elif taskType == "tts":
+                output = {
+                    "taskType": taskType,
+                    "config": {"audioFormat": "wav", "samplingRate": 22050},
+                    "audio": [{"audioContent": self.tone(text)} for text in texts],
+                }
+            else:
+                raise ValueError(f"Unsupported taskType: {taskType}")
+            pipelineResponse.append(output)
+        return {"pipelineResponse": pipelineResponse}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            body = b"".join(chunks)
+        else:
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return body
+
+    def reply(self, status, body) -> None:
+        data = json.dumps(body).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up first, e.g. a hedge loser or a missed deadline.
+            self.server.mock.count("abandoned")
+            self.close_connection = True
+
+    def do_POST(self) -> None:
+        mock = self.server.mock
+        try:
+            request = json.loads(self.read_body())
+        except ValueError:
+            mock.count("badRequests")
+            self.reply(400, {"message": "Request body is not valid JSON"})
+            return
+        if self.path == configPath:
+            mock.count("configCalls")
+            if not self.headers.get("userID") or not self.headers.get("ulcaApiKey"):
+                self.reply(401, {"message": "Missing userID or ulcaApiKey"})
+                return
+            time.sleep(mock.configLatency)
+            if mock.chance(mock.configErrorRate):
+                mock.count("configErrors")
+                self.reply(503, {"message": "Injected config failure"})
+                return
+            self.reply(200, mock.pipeline_config(request))
+        elif self.path == inferencePath:
+            mock.count("inferenceCalls")
+            if self.headers.get("Authorization") != inferenceApiKey:
+                self.reply(401, {"message": "Invalid inference key"})
+                return
+            time.sleep(mock.delay(request["pipelineTasks"]))
+            if mock.chance(mock.errorRate):
+                mock.count("inferenceErrors")
+                self.reply(mock.errorStatus, {"message": "Injected inference failure"})
+                return
+            try:
+                self.reply(200, mock.inference(request))
+            except (KeyError, ValueError) as error:
+                mock.count("badRequests")
+                self.reply(400, {"message": str(error)})
+        else:
+            self.reply(404, {"message": f"No route for {self.path}"})
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bhashini_translator.mock_server",
+        description="Serve a local stand-in for the Bhashini config and inference endpoints.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per task in a chain")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per task")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of inference calls that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--config-latency", type=float, default=0.0)
+    parser.add_argument("--config-error-rate", type=float, default=0.0)
+    parser.add_argument("--services", type=int, default=2, help="serviceIds offered per task")
+    parser.add_argument("--service-spread", type=float, default=0.0, help="extra seconds per serviceId index")
+    parser.add_argument("--transcript", default=defaultTranscript, help="text every ASR call returns")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    mock = MockBhashini(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        errorRate=args.error_rate,
+        errorStatus=args.error_status,
+        configLatency=args.config_latency,
+        configErrorRate=args.config_error_rate,
+        servicesPerTask=args.services,
+        serviceSpread=args.service_spread,
+        transcript=args.transcript,
+        seed=args.seed,
+    )
+    print(f"Mock Bhashini listening; use ulcaEndPoint={mock.ulcaEndPoint}")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
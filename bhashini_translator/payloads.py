@@ -1,81 +1,119 @@
 import json
+from bhashini_translator.config import maxBatchSize, maxBatchBytes
 from bhashini_translator.pipeline_config import PipelineConfig
+from bhashini_translator.request_body import build_audio_body, split_envelope
+
+
+def split_batches(texts, maxBatchSize=maxBatchSize, maxBatchBytes=maxBatchBytes):
+    """
+    Split texts into consecutive batches of at most maxBatchSize items and
+    maxBatchBytes UTF-8 bytes. A single text larger than the byte budget
+    still gets a batch of its own.
+    """
+    batch, batchBytes = [], 0
+    for text in texts:
+        size = len(text.encode("utf-8"))
+        if batch and (len(batch) >= maxBatchSize or batchBytes + size > maxBatchBytes):
+            yield batch
+            batch, batchBytes = [], 0
+        batch.append(text)
+        batchBytes += size
+    if batch:
+        yield batch
+
 
 class Payloads(PipelineConfig):
-    def nmt_payload(self, text: str) -> json:
+    def pipeline_payload(self, pipelineTasks: list, inputData: dict) -> json:
         return json.dumps(
             {
-                "pipelineTasks": [
-                    self.getPipeLineConfig("translation"),
-                ],
+                "pipelineTasks": pipelineTasks,
                 "pipelineRequestConfig": {
                     "pipelineId": self.pipeLineId,
                 },
-                "inputData": {"input": [{"source": text}]},
+                "inputData": inputData,
             }
         )
 
-    def tts_payload(self, text: str) -> json:
-        return json.dumps(
+    def audio_payload(self, pipelineTasks: list, audio):
+        """
+        Payload for audio input. `audio` is either a base64 string, as
+        before, or raw audio bytes; raw audio is base64-encoded straight
+        into a preallocated body instead of going through an intermediate
+        string, producing the same JSON bytes.
+        """
+        if isinstance(audio, str):
+            return self.pipeline_payload(pipelineTasks, {"audio": [{"audioContent": audio}]})
+        prefix, suffix = split_envelope(
             {
-                "pipelineTasks": [self.getPipeLineConfig("tts")],
+                "pipelineTasks": pipelineTasks,
                 "pipelineRequestConfig": {
                     "pipelineId": self.pipeLineId,
                 },
-                "inputData": {"input": [{"source": text}]},
-            }
+                "inputData": {"audio": [{"audioContent": None}]},
+            },
+            ("inputData", "audio", 0, "audioContent"),
         )
+        return build_audio_body(prefix, audio, suffix)
 
-    def asr_payload(self, base64String) -> json:
-        payload = {
-            "pipelineTasks": [
-                self.getPipeLineConfig("asr"),
-            ],
-            "pipelineRequestConfig": {
-                "pipelineId": self.pipeLineId,
-            },
-            "inputData": {"audio": [{"audioContent": base64String}]},
-        }
-        return json.dumps(payload)
+    @staticmethod
+    def batches(texts, maxBatchSize=None, maxBatchBytes=None):
+        limits = {}
+        if maxBatchSize:
+            limits["maxBatchSize"] = maxBatchSize
+        if maxBatchBytes:
+            limits["maxBatchBytes"] = maxBatchBytes
+        return split_batches(list(texts), **limits)
 
-    def asr_nmt_payload(self, base64String) -> json:
-        payload = {
-            "pipelineTasks": [
-                self.getPipeLineConfig("asr"),
-                self.getPipeLineConfig("translation"),
-            ],
-            "pipelineRequestConfig": {
-                "pipelineId": self.pipeLineId,
-            },
-            "inputData": {"audio": [{"audioContent": base64String}]},
-        }
-        return json.dumps(payload)
+    @staticmethod
+    def check_batch(batch, outputs) -> list:
+        if len(outputs) != len(batch):
+            raise ValueError(f"Expected {len(batch)} outputs in batch response, got {len(outputs)}")
+        return outputs
 
-    def nmt_tts_payload(self, text: str) -> json:
-        return json.dumps(
-            {
-                "pipelineTasks": [
-                    self.getPipeLineConfig("translation"),
-                    self.getPipeLineConfig("tts"),
-                ],
-                "pipelineRequestConfig": {
-                    "pipelineId": self.pipeLineId,
-                },
-                "inputData": {"input": [{"source": text}]},
-            }
+    def nmt_payload(self, text: str, pipelineTasks=None) -> json:
+        return self.pipeline_payload(
+            pipelineTasks or self.getPipeLineConfigs(["translation"]),
+            {"input": [{"source": text}]},
         )
 
-    def asr_nmt_tts_payload(self, base64String: str) -> json:
-        return json.dumps(
-            {
-                "pipelineTasks": [
-                    self.getPipeLineConfig("asr"),
-                    self.getPipeLineConfig("translation"),
-                    self.getPipeLineConfig("tts"),
-                ],
-                "pipelineRequestConfig": {
-                    "pipelineId": self.pipeLineId,
-                },
-                "inputData": {"audio": [{"audioContent": base64String}]},
-            }
+    def tts_payload(self, text: str, pipelineTasks=None) -> json:
+        return self.pipeline_payload(
+            pipelineTasks or self.getPipeLineConfigs(["tts"]),
+            {"input": [{"source": text}]},
+        )
+
+    def nmt_batch_payload(self, texts: list, pipelineTasks=None) -> json:
+        return self.pipeline_payload(
+            pipelineTasks or self.getPipeLineConfigs(["translation"]),
+            {"input": [{"source": text} for text in texts]},
+        )
+
+    def tts_batch_payload(self, texts: list, pipelineTasks=None) -> json:
+        return self.pipeline_payload(
+            pipelineTasks or self.getPipeLineConfigs(["tts"]),
+            {"input": [{"source": text} for text in texts]},
+        )
+
+    def asr_payload(self, audio, pipelineTasks=None):
+        return self.audio_payload(
+            pipelineTasks or self.getPipeLineConfigs(["asr"]),
+            audio,
+        )
+
+    def asr_nmt_payload(self, audio, pipelineTasks=None):
+        return self.audio_payload(
+            pipelineTasks or self.getPipeLineConfigs(["asr", "translation"]),
+            audio,
+        )
+
+    def nmt_tts_payload(self, text: str, pipelineTasks=None) -> json:
+        return self.pipeline_payload(
+            pipelineTasks or self.getPipeLineConfigs(["translation", "tts"]),
+            {"input": [{"source": text}]},
+        )
+
+    def asr_nmt_tts_payload(self, audio, pipelineTasks=None):
+        return self.audio_payload(
+            pipelineTasks or self.getPipeLineConfigs(["asr", "translation", "tts"]),
+            audio,
         )
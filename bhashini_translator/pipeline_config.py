@@ -1,7 +1,34 @@
-import requests
 import json
+from typing import NamedTuple
+from bhashini_translator.config_cache import ConfigCache
+from bhashini_translator.errors import BhashiniAPIError
+from bhashini_translator.ratelimit import ApiLimiter, get_default_api_limiter
+from bhashini_translator.service_selector import ServiceSelector, get_default_service_selector
+from bhashini_translator.transport import Transport, get_default_transport
+
+
+class ResolvedPipeline(NamedTuple):
+    """
+    Everything one inference call needs: the task configs stamped with
+    their serviceIds, the endpoint and headers to call, and the cache keys
+    to invalidate if the call is rejected. A new one is built for every
+    request and nothing else holds on to it, so concurrent calls on one
+    client never see each other's configs.
+    """
+
+    pipelineTasks: tuple
+    callbackUrl: str
+    headers: dict
+    cacheKeys: tuple
+    taskKey: str
+
 
 class PipelineConfig:
+    configCache: ConfigCache = None
+    transport: Transport = None
+    apiLimiter: ApiLimiter = None
+    serviceSelector: ServiceSelector = None
+
     def getTaskTypeConfig(self, taskType):
         taskTypeConfig = {
             "translation": {
@@ -31,29 +58,127 @@ class PipelineConfig:
             raise KeyError("Invalid task type.")
     
     def getPipeLineConfig(self, taskType):
-        taskTypeConfig = self.getTaskTypeConfig(taskType)
+        return self.getPipeLineConfigs([taskType])[0]
+
+    def getPipeLineConfigs(self, taskTypes):
+        return list(self.resolvePipeLine(taskTypes).pipelineTasks)
+
+    def resolvePipeLine(self, taskTypes) -> ResolvedPipeline:
+        """
+        Resolve the configs of a whole task chain. Tasks missing from the
+        cache are fetched together in a single getModelsPipeline request and
+        each returned pipelineResponseConfig entry is mapped back to its task.
+        """
+        taskTypeConfigs, cacheKeys, entries = self.lookupPipeLineConfigs(taskTypes)
+        missing = [taskTypeConfigs[index] for index, entry in enumerate(entries) if entry is None]
+        fetched = self.fetchPipeLineConfig(missing) if missing else None
+        pipeLineData = self.applyPipeLineConfigs(taskTypeConfigs, cacheKeys, entries, fetched)
+        return self.resolvedPipeLine(taskTypeConfigs, pipeLineData, cacheKeys)
+
+    @classmethod
+    def resolvedPipeLine(cls, taskTypeConfigs, pipeLineData, cacheKeys) -> ResolvedPipeline:
+        callbackUrl, headers = cls.inferenceRequest(pipeLineData)
+        return ResolvedPipeline(
+            pipelineTasks=tuple(taskTypeConfigs),
+            callbackUrl=callbackUrl,
+            headers=headers,
+            cacheKeys=tuple(cacheKeys),
+            taskKey="+".join(config["taskType"] for config in taskTypeConfigs),
+        )
+
+    def lookupPipeLineConfigs(self, taskTypes):
+        """
+        Build the task configs of a chain and look each one up in the cache.
+        Entries that are not cached are returned as None.
+        """
+        taskTypeConfigs = [self.getTaskTypeConfig(taskType) for taskType in taskTypes]
+        # Speech synthesized after a translation step speaks the target language.
+        for previous, taskTypeConfig in zip(taskTypeConfigs, taskTypeConfigs[1:]):
+            if previous["taskType"] == "translation" and taskTypeConfig["taskType"] == "tts":
+                taskTypeConfig["config"]["language"]["sourceLanguage"] = self.targetLanguage
+        cacheKeys = [ConfigCache.key(self.pipeLineId, config) for config in taskTypeConfigs]
+        entries = [
+            self.configCache.get(cacheKey) if self.configCache is not None else None
+            for cacheKey in cacheKeys
+        ]
+        return taskTypeConfigs, cacheKeys, entries
+
+    def applyPipeLineConfigs(self, taskTypeConfigs, cacheKeys, entries, fetched):
+        """
+        Fill the uncached entries from a getModelsPipeline response, store
+        them in the cache and stamp every task config with the serviceId the
+        service selector picks among its candidates. Returns the pipeline
+        data holding the inference endpoint.
+        """
+        missing = [index for index, entry in enumerate(entries) if entry is None]
+        if missing:
+            endPoint = fetched.get("pipelineInferenceAPIEndPoint")
+            candidateLists = self.mapServiceIds(
+                [taskTypeConfigs[index]["taskType"] for index in missing],
+                fetched["pipelineResponseConfig"],
+            )
+            for index, candidates in zip(missing, candidateLists):
+                entries[index] = {
+                    "serviceId": candidates[0],
+                    "candidates": candidates,
+                    "pipelineInferenceAPIEndPoint": endPoint,
+                }
+                if self.configCache is not None:
+                    self.configCache.put(cacheKeys[index], candidates[0], endPoint, candidates)
+            pipeLineData = fetched
+        else:
+            pipeLineData = {"pipelineInferenceAPIEndPoint": entries[0]["pipelineInferenceAPIEndPoint"]}
+        selector = self.selector()
+        chain = "+".join(taskTypeConfig["taskType"] for taskTypeConfig in taskTypeConfigs)
+        for taskTypeConfig, entry in zip(taskTypeConfigs, entries):
+            candidates = entry.get("candidates") or [entry["serviceId"]]
+            taskTypeConfig["config"]["serviceId"] = selector.choose(chain, taskTypeConfig, candidates)
+        return pipeLineData
+
+    def selector(self) -> ServiceSelector:
+        return self.serviceSelector if self.serviceSelector is not None else get_default_service_selector()
+
+    @staticmethod
+    def mapServiceIds(taskTypes, pipelineResponseConfig):
+        """
+        Match response entries to the requested tasks by taskType, falling
+        back to position for entries that do not echo their taskType.
+        Returns every serviceId offered for each task, in response order.
+        """
+        unused = list(pipelineResponseConfig)
+        candidateLists = []
+        for position, taskType in enumerate(taskTypes):
+            match = next((entry for entry in unused if entry.get("taskType") == taskType), None)
+            if match is None:
+                if position >= len(pipelineResponseConfig):
+                    raise KeyError(f"No pipeline config returned for task {taskType}.")
+                match = pipelineResponseConfig[position]
+            if match in unused:
+                unused.remove(match)
+            candidateLists.append([config.get("serviceId") for config in match.get("config")])
+        return candidateLists
+
+    def configRequest(self, taskTypeConfigs):
         payload = json.dumps(
             {
-                "pipelineTasks": [taskTypeConfig],
+                "pipelineTasks": taskTypeConfigs,
                 "pipelineRequestConfig": {
                     "pipelineId": self.pipeLineId,
                 },
             }
         )
-        response = requests.post(
-            self.ulcaEndPoint,
-            data=payload,
-            headers={
-                "ulcaApiKey": self.ulcaApiKey,
-                "userID": self.ulcaUserId,
-                "Content-Type": "application/json",
-            },
-        )
-        if response.status_code != 200:
-            error_details = f"""
+        headers = {
+            "ulcaApiKey": self.ulcaApiKey,
+            "userID": self.ulcaUserId,
+            "Content-Type": "application/json",
+        }
+        return payload, headers
+
+    def configError(self, statusCode, responseText) -> BhashiniAPIError:
+        error_details = f"""
             ❌ Bhashini API Error:
-            - Status Code: {response.status_code}
-            - Response: {response.text}
+            - Status Code: {statusCode}
+            - Response: {responseText}
             - Endpoint: {self.ulcaEndPoint}
             - Pipeline ID: {self.pipeLineId}
             
@@ -62,13 +187,23 @@ class PipelineConfig:
             2. Your Bhashini account has API access approved
             3. The Pipeline ID is correct
             """
-            print(error_details)
-            raise ValueError(error_details)
-        serviceId = (
-            response.json()["pipelineResponseConfig"][0]
-            .get("config")[0]
-            .get("serviceId")
-        )
-        taskTypeConfig["config"]["serviceId"] = serviceId
-        self.pipeLineData = response.json()
-        return taskTypeConfig
+        print(error_details)
+        return BhashiniAPIError(error_details, statusCode, responseText)
+
+    @staticmethod
+    def inferenceRequest(pipeLineData):
+        endPoint = pipeLineData.get("pipelineInferenceAPIEndPoint")
+        headers = {
+            "Authorization": endPoint.get("inferenceApiKey").get("value"),
+            "Content-Type": "application/json",
+        }
+        return endPoint.get("callbackUrl"), headers
+
+    def fetchPipeLineConfig(self, taskTypeConfigs):
+        payload, headers = self.configRequest(taskTypeConfigs)
+        transport = self.transport if self.transport is not None else get_default_transport()
+        apiLimiter = self.apiLimiter if self.apiLimiter is not None else get_default_api_limiter()
+        response = apiLimiter.call("config", lambda: transport.post(self.ulcaEndPoint, data=payload, headers=headers))
+        if response.status_code != 200:
+            raise self.configError(response.status_code, response.text)
+        return response.json()
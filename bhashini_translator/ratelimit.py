@@ -0,0 +1,275 @@
+import asyncio
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+import requests
+from bhashini_translator.config import (
+    configRateLimit,
+    inferenceRateLimit,
+    rateLimitWait,
+    breakerFailureThreshold,
+    breakerResetTimeout,
+)
+from bhashini_translator.errors import CircuitOpenError, RateLimitedError
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_bucketState = struct.Struct("<dd")
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second with bursts of up to `capacity`.
+
+    With `path` (and on platforms with fcntl) the bucket state lives in
+    that file under an exclusive lock, so every process on the machine
+    using the same file shares one budget. Otherwise the bucket is shared
+    by the threads of this process.
+    """
+
+    def __init__(self, rate, capacity, path=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.path = path if fcntl is not None else None
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.counters = defaultdict(int)
+
+    def take(self) -> float:
+        """
+        Take a token if one is available and return 0, otherwise return the
+        number of seconds until one will be.
+        """
+        if self.path:
+            return self.take_shared()
+        with self.lock:
+            now = time.monotonic()
+            self.tokens, wait = self.refill(self.tokens, now - self.updated)
+            self.updated = now
+            return wait
+
+    def take_shared(self) -> float:
+        with open(self.path, "a+b") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            file.seek(0)
+            raw = file.read(_bucketState.size)
+            now = time.time()
+            tokens, updated = _bucketState.unpack(raw) if len(raw) == _bucketState.size else (self.capacity, now)
+            tokens, wait = self.refill(tokens, max(0.0, now - updated))
+            file.seek(0)
+            file.truncate()
+            file.write(_bucketState.pack(tokens, now))
+            return wait
+
+    def refill(self, tokens, elapsed):
+        tokens = min(float(self.capacity), tokens + elapsed * self.rate)
+        if tokens >= 1:
+            return tokens - 1, 0.0
+        return tokens, (1 - tokens) / self.rate
+
+    def acquire(self, timeout=rateLimitWait) -> bool:
+        started = time.monotonic()
+        wait = self.take()
+        while wait:
+            remaining = timeout - (time.monotonic() - started)
+            if wait > remaining:
+                return self.count(started, acquired=False)
+            with self.lock:
+                self.counters["queued"] += 1
+            time.sleep(wait)
+            wait = self.take()
+        return self.count(started, acquired=True)
+
+    async def acquire_async(self, timeout=rateLimitWait) -> bool:
+        started = time.monotonic()
+        wait = self.take()
+        while wait:
+            remaining = timeout - (time.monotonic() - started)
+            if wait > remaining:
+                return self.count(started, acquired=False)
+            with self.lock:
+                self.counters["queued"] += 1
+            await asyncio.sleep(wait)
+            wait = self.take()
+        return self.count(started, acquired=True)
+
+    def count(self, started, acquired) -> bool:
+        with self.lock:
+            self.counters["acquired" if acquired else "rejected"] += 1
+            self.counters["waitSeconds"] += time.monotonic() - started
+        return acquired
+
+    def stats(self) -> dict:
+        with self.lock:
+            return dict(self.counters)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failureThreshold` consecutive failures and rejects calls
+    until `resetTimeout` seconds have passed. Then it half-opens and lets a
+    single probe through: success closes it, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failureThreshold=breakerFailureThreshold, resetTimeout=breakerResetTimeout):
+        self.failureThreshold = failureThreshold
+        self.resetTimeout = resetTimeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.openedAt = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+        self.counters = defaultdict(int)
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.state == self.OPEN and time.monotonic() - self.openedAt >= self.resetTimeout:
+                self.state = self.HALF_OPEN
+                self.probing = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self.probing:
+                self.probing = True
+                self.counters["probes"] += 1
+                return True
+            self.counters["rejected"] += 1
+            return False
+
+    def cancel(self) -> None:
+        """
+        Give back a probe slot taken by allow() for a call that was never sent.
+        """
+        with self.lock:
+            self.probing = False
+
+    def record(self, success) -> None:
+        with self.lock:
+            self.probing = False
+            if success:
+                self.state = self.CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failureThreshold):
+                self.state = self.OPEN
+                self.openedAt = time.monotonic()
+                self.counters["tripped"] += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            return dict(self.counters, state=self.state, failures=self.failures)
+
+
+class ApiLimiter:
+    """
+    A token bucket and a circuit breaker per budget. Config and inference
+    calls draw from separate budgets, so a burst of inference traffic does
+    not starve config resolution and an inference outage does not block it.
+
+    A call fails fast with CircuitOpenError while its circuit is open, and
+    with RateLimitedError when no token arrives within `waitTimeout`.
+    Connection errors, 429 and 5xx responses count as failures.
+    """
+
+    def __init__(
+        self,
+        budgets=None,
+        statePath=None,
+        waitTimeout=rateLimitWait,
+        failureThreshold=breakerFailureThreshold,
+        resetTimeout=breakerResetTimeout,
+    ):
+        budgets = budgets or {"config": configRateLimit, "inference": inferenceRateLimit}
+        self.waitTimeout = waitTimeout
+        self.buckets = {
+            budget: TokenBucket(rate, capacity, os.path.join(statePath, f"{budget}.bucket") if statePath else None)
+            for budget, (rate, capacity) in budgets.items()
+        }
+        self.breakers = {budget: CircuitBreaker(failureThreshold, resetTimeout) for budget in budgets}
+
+    def before(self, budget) -> None:
+        if not self.breakers[budget].allow():
+            raise CircuitOpenError(f"Circuit for {budget} calls is open")
+        try:
+            acquired = self.buckets[budget].acquire(self.waitTimeout)
+        except BaseException:
+            self.cancel(budget)
+            raise
+        if not acquired:
+            self.cancel(budget)
+            raise RateLimitedError(f"No {budget} request token within {self.waitTimeout}s")
+
+    async def before_async(self, budget) -> None:
+        if not self.breakers[budget].allow():
+            raise CircuitOpenError(f"Circuit for {budget} calls is open")
+        try:
+            acquired = await self.buckets[budget].acquire_async(self.waitTimeout)
+        except BaseException:
+            # Cancelled while waiting for a token, e.g. by a deadline.
+            self.cancel(budget)
+            raise
+        if not acquired:
+            self.cancel(budget)
+            raise RateLimitedError(f"No {budget} request token within {self.waitTimeout}s")
+
+    def cancel(self, budget) -> None:
+        """
+        Release a call let through by before() without scoring it, for a
+        call that was abandoned rather than answered.
+        """
+        self.breakers[budget].cancel()
+
+    def after(self, budget, statusCode=None) -> None:
+        """
+        Record the outcome of a call; statusCode None means it raised.
+        """
+        self.breakers[budget].record(statusCode is not None and statusCode != 429 and statusCode < 500)
+
+    def call(self, budget, send) -> requests.Response:
+        self.before(budget)
+        try:
+            response = send()
+        except requests.RequestException:
+            self.after(budget)
+            raise
+        except BaseException:
+            self.cancel(budget)
+            raise
+        self.after(budget, response.status_code)
+        return response
+
+    def stats(self) -> dict:
+        return {
+            budget: {"bucket": self.buckets[budget].stats(), "breaker": self.breakers[budget].stats()}
+            for budget in self.buckets
+        }
+
+
+_defaultApiLimiter = None
+_defaultApiLimiterLock = threading.Lock()
+
+
+def get_default_api_limiter() -> ApiLimiter:
+    """
+    Process-wide limiter shared by every client. Set RateLimitDir to a
+    directory in the environment to share the token buckets with other
+    processes on this machine.
+    """
+    global _defaultApiLimiter
+    with _defaultApiLimiterLock:
+        if _defaultApiLimiter is None:
+            statePath = os.environ.get("RateLimitDir")
+            if statePath:
+                os.makedirs(statePath, exist_ok=True)
+            _defaultApiLimiter = ApiLimiter(statePath=statePath)
+        return _defaultApiLimiter
@@ -0,0 +1,48 @@
+import binascii
+import json
+from bhashini_translator.config import bodyChunkSize
+
+_placeholder = "\0audioContent\0"
+
+
+def split_envelope(payload: dict, audioPath: tuple) -> tuple:
+    """
+    Serialize payload with a placeholder at audioPath (a sequence of keys
+    and list indexes) and return the JSON bytes before and after it. The
+    placeholder is replaced by a quoted base64 string, which never needs
+    escaping, so prefix + base64 + suffix equals json.dumps of the full
+    payload byte for byte.
+    """
+    container = payload
+    for step in audioPath[:-1]:
+        container = container[step]
+    container[audioPath[-1]] = _placeholder
+    prefix, suffix = json.dumps(payload).split(json.dumps(_placeholder))
+    return prefix.encode("ascii") + b'"', b'"' + suffix.encode("ascii")
+
+
+def base64_length(size) -> int:
+    return 4 * ((size + 2) // 3)
+
+
+def build_audio_body(prefix, audio, suffix, chunkSize=bodyChunkSize) -> bytearray:
+    """
+    Build the whole request body in one preallocated bytearray, encoding
+    the raw audio straight into it. Besides the body itself, only one
+    encoded chunk is alive at a time.
+    """
+    chunkSize -= chunkSize % 3
+    audio = memoryview(audio).cast("B")
+    body = bytearray(len(prefix) + base64_length(len(audio)) + len(suffix))
+    view = memoryview(body)
+    view[: len(prefix)] = prefix
+    offset = len(prefix)
+    for start in range(0, len(audio), chunkSize):
+        chunk = audio[start : start + chunkSize]
+        size = base64_length(len(chunk))
+        # Assigned without a name, so each encoded chunk is freed before the next is made.
+        view[offset : offset + size] = binascii.b2a_base64(chunk, newline=False)
+        offset += size
+    view[offset:] = suffix
+    view.release()
+    return body
@@ -0,0 +1,181 @@
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import NamedTuple
+import requests
+from bhashini_translator.config import connectTimeout, readTimeout, retryStatusCodes, stageDeadlines
+from bhashini_translator.errors import BhashiniAPIError
+
+
+class RetryPolicy(NamedTuple):
+    """
+    How one task type (or chain, e.g. "asr+translation+tts") is retried.
+    Backoff uses full jitter: a random delay between 0 and
+    min(maxDelay, baseDelay * 2 ** attempt). With `hedge`, a duplicate
+    request is fired once the first has been outstanding for the
+    hedgeQuantile latency of recent calls, and the first answer wins.
+    """
+
+    deadline: float = 30.0
+    maxAttempts: int = 3
+    baseDelay: float = 0.2
+    maxDelay: float = 2.0
+    retryStatuses: tuple = retryStatusCodes
+    hedge: bool = False
+    hedgeQuantile: float = 0.95
+    hedgeMinSamples: int = 20
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent latencies per key.
+    """
+
+    def __init__(self, window=200):
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.lock = threading.Lock()
+
+    def record(self, key, seconds) -> None:
+        with self.lock:
+            self.samples[key].append(seconds)
+
+    def quantile(self, key, q, minSamples=1):
+        with self.lock:
+            samples = sorted(self.samples[key])
+        if len(samples) < minSamples or not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class Resilience:
+    """
+    Runs inference requests under a per-task RetryPolicy and counts how
+    often retries and hedges were needed.
+    """
+
+    def __init__(self, policies=None, defaultPolicy=None, maxHedgeWorkers=32):
+        self.policies = dict(policies or {})
+        self.defaultPolicy = defaultPolicy
+        self.latencies = LatencyTracker()
+        self.counters = defaultdict(lambda: defaultdict(int))
+        self.lock = threading.Lock()
+        self.maxHedgeWorkers = maxHedgeWorkers
+        self.executor = None
+
+    def policy(self, taskKey) -> RetryPolicy:
+        if taskKey in self.policies:
+            return self.policies[taskKey]
+        if self.defaultPolicy is not None:
+            return self.defaultPolicy
+        deadline = sum(stageDeadlines.get(taskType, 10.0) for taskType in taskKey.split("+"))
+        return RetryPolicy(deadline=deadline)
+
+    def count(self, taskKey, name) -> None:
+        with self.lock:
+            self.counters[taskKey][name] += 1
+
+    def call(self, taskKey, send) -> requests.Response:
+        """
+        Call send(timeout) until it returns a non-retryable response, the
+        attempts run out or the deadline passes. timeout is a requests
+        (connect, read) tuple capped by the time left.
+        """
+        policy = self.policy(taskKey)
+        started = time.monotonic()
+        self.count(taskKey, "calls")
+        attempt = 0
+        while True:
+            remaining = policy.deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                self.count(taskKey, "deadlineExceeded")
+                raise BhashiniAPIError(f"Deadline of {policy.deadline}s exceeded for {taskKey}")
+            timeout = (min(connectTimeout, remaining), min(readTimeout, remaining))
+            try:
+                response = self.attempt(taskKey, policy, send, timeout)
+                error = None
+            except requests.RequestException as exception:
+                response, error = None, exception
+            attempt += 1
+            retryable = error is not None or response.status_code in policy.retryStatuses
+            if not retryable or attempt >= policy.maxAttempts:
+                break
+            delay = random.uniform(0, min(policy.maxDelay, policy.baseDelay * 2 ** (attempt - 1)))
+            if delay >= policy.deadline - (time.monotonic() - started):
+                break
+            if response is not None:
+                response.close()
+            self.count(taskKey, "retries")
+            time.sleep(delay)
+        if error is not None:
+            self.count(taskKey, "failures")
+            raise BhashiniAPIError(f"Inference request failed: {error}") from error
+        if response.status_code != 200:
+            self.count(taskKey, "failures")
+        return response
+
+    def attempt(self, taskKey, policy, send, timeout) -> requests.Response:
+        hedgeDelay = None
+        if policy.hedge:
+            hedgeDelay = self.latencies.quantile(taskKey, policy.hedgeQuantile, policy.hedgeMinSamples)
+        started = time.monotonic()
+        if hedgeDelay is None:
+            response = send(timeout)
+        else:
+            response = self.hedged(taskKey, send, timeout, hedgeDelay)
+        if response.status_code == 200:
+            self.latencies.record(taskKey, time.monotonic() - started)
+        return response
+
+    def hedged(self, taskKey, send, timeout, hedgeDelay) -> requests.Response:
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.maxHedgeWorkers, thread_name_prefix="bhashini-hedge")
+        futures = [self.executor.submit(send, timeout)]
+        done, _ = wait(futures, timeout=hedgeDelay)
+        if not done:
+            self.count(taskKey, "hedges")
+            futures.append(self.executor.submit(send, timeout))
+        pending = set(futures)
+        winner = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and future.result().status_code == 200:
+                    winner = future
+                    break
+        if winner is None:
+            # Neither copy succeeded; surface the first one's outcome.
+            winner = futures[0]
+        elif winner is not futures[0]:
+            self.count(taskKey, "hedgeWins")
+        for future in futures:
+            if future is not winner:
+                future.add_done_callback(_close_response)
+        return winner.result()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {taskKey: dict(counters) for taskKey, counters in self.counters.items()}
+
+
+def _close_response(future) -> None:
+    if future.exception() is None:
+        future.result().close()
+
+
+_defaultResilience = None
+_defaultResilienceLock = threading.Lock()
+
+
+def get_default_resilience() -> Resilience:
+    """
+    Process-wide resilience layer shared by every Bhashini instance, so
+    latency history and counters cover all traffic.
+    """
+    global _defaultResilience
+    with _defaultResilienceLock:
+        if _defaultResilience is None:
+            _defaultResilience = Resilience()
+        return _defaultResilience
@@ -0,0 +1,94 @@
+import binascii
+import json
+
+_audioKey = b'"audioContent"'
+
+
+class AudioContentExtractor:
+    """
+    Incrementally scans a pipeline JSON response and base64-decodes the
+    first "audioContent" string into `sink` (anything with a write(bytes)
+    method: a file, socket.makefile("wb"), or an audio player stream) as
+    the bytes arrive. Apart from a few bytes of carry-over, memory use does
+    not grow with the audio length.
+
+    The rest of the document is kept with the audio value emptied, so
+    finish() can still return the parsed response (transcripts,
+    translations and so on).
+    """
+
+    SEARCH, OPEN, VALUE, DONE = range(4)
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.state = self.SEARCH
+        self.pending = bytearray()
+        self.carry = bytearray()
+        self.rest = bytearray()
+        self.bytesWritten = 0
+
+    def feed(self, chunk) -> None:
+        self.pending += chunk
+        while self.pending:
+            if self.state == self.SEARCH:
+                index = self.pending.find(_audioKey)
+                if index < 0:
+                    keep = len(_audioKey) - 1
+                    self.move(max(0, len(self.pending) - keep))
+                    return
+                self.move(index + len(_audioKey))
+                self.state = self.OPEN
+            elif self.state == self.OPEN:
+                index = self.pending.find(b'"')
+                if index < 0:
+                    self.move(len(self.pending))
+                    return
+                self.move(index + 1)
+                self.state = self.VALUE
+            elif self.state == self.VALUE:
+                index = self.pending.find(b'"')
+                end = index if index >= 0 else len(self.pending)
+                if index < 0 and self.pending.endswith(b"\\"):
+                    end -= 1
+                self.carry += self.pending[:end].replace(b"\\/", b"/")
+                del self.pending[:end]
+                self.decode(final=index >= 0)
+                if index < 0:
+                    return
+                self.state = self.DONE
+            else:
+                self.move(len(self.pending))
+
+    def move(self, count) -> None:
+        self.rest += self.pending[:count]
+        del self.pending[:count]
+
+    def decode(self, final=False) -> None:
+        usable = len(self.carry) if final else len(self.carry) - len(self.carry) % 4
+        if not usable:
+            return
+        try:
+            audio = binascii.a2b_base64(bytes(self.carry[:usable]))
+        except binascii.Error as error:
+            raise ValueError(f"Invalid base64 in audioContent: {error}")
+        del self.carry[:usable]
+        self.sink.write(audio)
+        self.bytesWritten += len(audio)
+
+    def finish(self) -> dict:
+        if self.state == self.VALUE:
+            raise ValueError("Response ended inside audioContent")
+        self.move(len(self.pending))
+        return json.loads(bytes(self.rest))
+
+
+def stream_audio_content(chunks, sink):
+    """
+    Feed an iterable of response byte chunks through an extractor. Returns
+    the extractor, whose bytesWritten and finish() report the outcome.
+    """
+    extractor = AudioContentExtractor(sink)
+    for chunk in chunks:
+        if chunk:
+            extractor.feed(chunk)
+    return extractor
@@ -0,0 +1,69 @@
+from typing import NamedTuple, Optional
+
+
+class SpeechTurn(NamedTuple):
+    """
+    Every intermediate output of one ASR -> NMT -> TTS inference call.
+    audioContent is base64 WAV, or None when the audio was streamed to a sink.
+    """
+
+    transcript: str
+    translation: str
+    audioContent: Optional[str]
+
+    @classmethod
+    def from_response(cls, pipelineResponse: dict) -> "SpeechTurn":
+        stages = pipelineResponse.get("pipelineResponse")
+        audioContent = stages[2].get("audio")[0].get("audioContent")
+        return cls(
+            transcript=stages[0].get("output")[0].get("source"),
+            translation=stages[1].get("output")[0].get("target"),
+            audioContent=audioContent or None,
+        )
+
+
+class SegmentResult(NamedTuple):
+    """
+    One sentence of a segmented translate-and-speak run.
+    """
+
+    index: int
+    text: str
+    translation: str
+    audioContent: str
+    seconds: float
+
+
+class BroadcastResult(NamedTuple):
+    """
+    One target language of a broadcast. On failure translation and
+    audioContent are None and error holds the exception.
+    """
+
+    language: str
+    translation: Optional[str]
+    audioContent: Optional[str]
+    seconds: float
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Broadcast(NamedTuple):
+    """
+    A transcript recognized once and its BroadcastResults, in the order the
+    target languages were given.
+    """
+
+    transcript: str
+    asrSeconds: float
+    results: tuple
+
+    def by_language(self) -> dict:
+        return {result.language: result for result in self.results}
+
+    @property
+    def failed(self) -> tuple:
+        return tuple(result for result in self.results if not result.ok)
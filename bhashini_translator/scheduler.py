@@ -0,0 +1,184 @@
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from bhashini_translator.config import schedulerWorkers, schedulerBatchWorkers, schedulerAgingSeconds
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+_currentLane = contextvars.ContextVar("bhashini_lane", default=INTERACTIVE)
+
+
+@contextlib.contextmanager
+def lane(name):
+    """
+    Run the calls made inside the block in the given lane.
+    """
+    token = _currentLane.set(name)
+    try:
+        yield
+    finally:
+        _currentLane.reset(token)
+
+
+def in_lane(name):
+    """
+    Decorator running every call a function makes in the given lane.
+    """
+
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with lane(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def current_lane() -> str:
+    return _currentLane.get()
+
+
+class _Job:
+    __slots__ = ("future", "call", "enqueuedAt")
+
+    def __init__(self, call):
+        self.future = Future()
+        self.call = call
+        self.enqueuedAt = time.monotonic()
+
+
+class Scheduler:
+    """
+    Runs inference calls on a bounded pool of `workers` threads, fed from
+    two lanes. Interactive jobs are always dispatched first. Batch jobs run
+    on leftover capacity, and at most `batchWorkers` of them at once, so a
+    worker stays free for the next speech turn.
+
+    A batch job that has waited `agingSeconds` competes with interactive
+    jobs in arrival order, so batch work is never starved completely.
+    """
+
+    def __init__(self, workers=schedulerWorkers, batchWorkers=schedulerBatchWorkers, agingSeconds=schedulerAgingSeconds):
+        self.workers = workers
+        self.batchWorkers = min(batchWorkers, workers)
+        self.agingSeconds = agingSeconds
+        self.queues = {INTERACTIVE: deque(), BATCH: deque()}
+        self.running = {INTERACTIVE: 0, BATCH: 0}
+        self.metrics = {
+            name: {"submitted": 0, "completed": 0, "failed": 0, "aged": 0, "waitSeconds": 0.0, "maxWaitSeconds": 0.0}
+            for name in self.queues
+        }
+        self.condition = threading.Condition()
+        self.threads = []
+        self.closed = False
+
+    def submit(self, laneName, call, *args, **kwargs) -> Future:
+        if laneName not in self.queues:
+            raise ValueError(f"Unknown lane: {laneName}")
+        job = _Job(lambda: call(*args, **kwargs))
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Scheduler is shut down")
+            self.queues[laneName].append(job)
+            self.metrics[laneName]["submitted"] += 1
+            if len(self.threads) < self.workers:
+                thread = threading.Thread(target=self.work, name=f"bhashini-scheduler-{len(self.threads)}", daemon=True)
+                self.threads.append(thread)
+                thread.start()
+            self.condition.notify()
+        return job.future
+
+    def run(self, laneName, call, *args, **kwargs):
+        """
+        Submit a call and wait for its result in the calling thread.
+        """
+        return self.submit(laneName, call, *args, **kwargs).result()
+
+    def next_job(self):
+        """
+        Pick the next job to dispatch, or None. Called with the lock held.
+        """
+        interactive, batch = self.queues[INTERACTIVE], self.queues[BATCH]
+        batchAllowed = batch and self.running[BATCH] < self.batchWorkers
+        if batchAllowed:
+            aged = time.monotonic() - batch[0].enqueuedAt >= self.agingSeconds
+            if not interactive or (aged and batch[0].enqueuedAt < interactive[0].enqueuedAt):
+                if interactive:
+                    self.metrics[BATCH]["aged"] += 1
+                return BATCH, batch.popleft()
+        if interactive:
+            return INTERACTIVE, interactive.popleft()
+        return None
+
+    def work(self) -> None:
+        while True:
+            with self.condition:
+                picked = self.next_job()
+                while picked is None:
+                    if self.closed:
+                        return
+                    self.condition.wait()
+                    picked = self.next_job()
+                laneName, job = picked
+                self.running[laneName] += 1
+                waited = time.monotonic() - job.enqueuedAt
+                metrics = self.metrics[laneName]
+                metrics["waitSeconds"] += waited
+                metrics["maxWaitSeconds"] = max(metrics["maxWaitSeconds"], waited)
+            failed = False
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    job.future.set_result(job.call())
+                except BaseException as error:
+                    failed = True
+                    job.future.set_exception(error)
+            with self.condition:
+                self.running[laneName] -= 1
+                self.metrics[laneName]["failed" if failed else "completed"] += 1
+                # A finished batch job may unblock a queued one.
+                self.condition.notify()
+
+    def stats(self) -> dict:
+        with self.condition:
+            stats = {}
+            for name, metrics in self.metrics.items():
+                dispatched = metrics["completed"] + metrics["failed"] + self.running[name]
+                stats[name] = dict(
+                    metrics,
+                    depth=len(self.queues[name]),
+                    running=self.running[name],
+                    meanWaitSeconds=metrics["waitSeconds"] / dispatched if dispatched else 0.0,
+                )
+            return stats
+
+    def shutdown(self, wait=True) -> None:
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+            threads = list(self.threads)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+_defaultScheduler = None
+_defaultSchedulerLock = threading.Lock()
+
+
+def get_default_scheduler() -> Scheduler:
+    """
+    Process-wide scheduler shared by every Bhashini instance, so all
+    sessions and batch jobs draw from one pool.
+    """
+    global _defaultScheduler
+    with _defaultSchedulerLock:
+        if _defaultScheduler is None:
+            _defaultScheduler = Scheduler()
+        return _defaultScheduler
@@ -0,0 +1,41 @@
+import re
+
+# Sentence enders: Latin punctuation, Devanagari danda / double danda
+# (purna viram), and the Urdu full stop and question mark. A run such as
+# "?!" or "।।" ends one sentence, so the split comes after the whole run.
+_sentenceEnd = re.compile(r"(?<=[!?।॥۔؟])(?![!?।॥۔؟])\s*|(?<=\.)\s+")
+
+# Words whose trailing period does not end a sentence (compared lowercased,
+# without the period). Single-letter initials are handled separately.
+_abbreviations = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "no", "nos", "vs", "etc",
+    "e.g", "i.e", "approx", "dept", "govt", "ltd", "rs", "shri", "smt", "kum", "km", "hrs",
+}
+
+
+def _ends_with_abbreviation(sentence) -> bool:
+    words = sentence[:-1].split() if sentence.endswith(".") else None
+    if not words:
+        return False
+    word = words[-1]
+    return word.lower() in _abbreviations or (len(word) == 1 and word.isupper())
+
+
+def split_sentences(text, minLength=3) -> list:
+    """
+    Split text into sentences. A period only ends a sentence when followed
+    by whitespace, so times and decimals such as 12.30 stay intact, and
+    not after an abbreviation or initial such as "Mr." or "R.".
+    Fragments shorter than minLength characters are merged into the
+    previous sentence.
+    """
+    sentences = []
+    for piece in _sentenceEnd.split(text):
+        piece = piece.strip()
+        if not piece:
+            continue
+        if sentences and (len(piece) < minLength or _ends_with_abbreviation(sentences[-1])):
+            sentences[-1] = f"{sentences[-1]} {piece}"
+        else:
+            sentences.append(piece)
+    return sentences
@@ -0,0 +1,155 @@
+import json
+import os
+import random
+import threading
+import time
+from bhashini_translator.config import (
+    serviceExploreRate,
+    serviceMinSamples,
+    serviceLatencyAlpha,
+    serviceErrorAlpha,
+    serviceMaxErrorRate,
+)
+
+
+class ServiceSelector:
+    """
+    Chooses among the serviceIds ULCA offers for a task. Latency and error
+    rate are tracked per service as exponentially weighted moving
+    averages. They are scoped by task chain, because a chained call is only
+    timed as a whole.
+
+    A service with fewer than `minSamples` calls is tried first. Otherwise,
+    with probability `exploreRate`, a random candidate is tried, so a
+    service that has recovered can win again. The rest of the time the
+    fastest service whose error rate is under `maxErrorRate` is used; a
+    service that has never succeeded does not qualify.
+
+    With `path`, the scores are kept in that JSON file so they survive
+    restarts and can be shown by `python -m bhashini_translator scoreboard`.
+    """
+
+    def __init__(
+        self,
+        path=None,
+        exploreRate=serviceExploreRate,
+        minSamples=serviceMinSamples,
+        latencyAlpha=serviceLatencyAlpha,
+        errorAlpha=serviceErrorAlpha,
+        maxErrorRate=serviceMaxErrorRate,
+        saveEvery=20,
+    ):
+        self.path = path
+        self.exploreRate = exploreRate
+        self.minSamples = minSamples
+        self.latencyAlpha = latencyAlpha
+        self.errorAlpha = errorAlpha
+        self.maxErrorRate = maxErrorRate
+        self.saveEvery = saveEvery
+        self.scores = {}
+        self.unsaved = 0
+        self.lock = threading.Lock()
+        if self.path:
+            self.load()
+
+    @staticmethod
+    def key(chain, taskTypeConfig, serviceId) -> tuple:
+        language = taskTypeConfig.get("config", {}).get("language", {})
+        return (
+            chain,
+            taskTypeConfig.get("taskType"),
+            language.get("sourceLanguage"),
+            language.get("targetLanguage"),
+            serviceId,
+        )
+
+    def choose(self, chain, taskTypeConfig, candidates) -> str:
+        if len(candidates) == 1:
+            return candidates[0]
+        with self.lock:
+            scores = [self.scores.get(self.key(chain, taskTypeConfig, serviceId)) for serviceId in candidates]
+        counts = [score["calls"] if score else 0 for score in scores]
+        if min(counts) < self.minSamples:
+            return candidates[counts.index(min(counts))]
+        if random.random() < self.exploreRate:
+            return random.choice(candidates)
+        # A service that has never succeeded has no latency to rank it by.
+        healthy = [
+            (score["latency"], serviceId)
+            for serviceId, score in zip(candidates, scores)
+            if score["errorRate"] < self.maxErrorRate and score["latency"] is not None
+        ]
+        if not healthy:
+            healthy = [(score["errorRate"], serviceId) for serviceId, score in zip(candidates, scores)]
+        return min(healthy)[1]
+
+    def record(self, chain, pipelineTasks, seconds, success) -> None:
+        """
+        Score every service of a finished call. A failure's time is not
+        used as a latency sample.
+        """
+        with self.lock:
+            for taskTypeConfig in pipelineTasks:
+                key = self.key(chain, taskTypeConfig, taskTypeConfig.get("config", {}).get("serviceId"))
+                score = self.scores.get(key)
+                if score is None:
+                    score = self.scores[key] = {"calls": 0, "errors": 0, "latency": None, "errorRate": 0.0}
+                score["calls"] += 1
+                score["errors"] += 0 if success else 1
+                score["errorRate"] += self.errorAlpha * ((0.0 if success else 1.0) - score["errorRate"])
+                if success:
+                    latency = score["latency"]
+                    score["latency"] = seconds if latency is None else latency + self.latencyAlpha * (seconds - latency)
+                score["updatedAt"] = time.time()
+            self.unsaved += 1
+            save = self.path and self.unsaved >= self.saveEvery
+        if save:
+            self.save()
+
+    def scoreboard(self) -> list:
+        """
+        One row per service, grouped by chain, task and language, fastest
+        first within each group.
+        """
+        with self.lock:
+            rows = [dict(score, key=key) for key, score in self.scores.items()]
+        rows.sort(key=lambda row: (tuple(str(part) for part in row["key"][:4]), row["latency"] is None, row["latency"] or 0))
+        return rows
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self.lock:
+            for item in stored:
+                key = tuple(item.pop("key"))
+                self.scores[key] = item
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self.lock:
+            stored = [dict(score, key=list(key)) for key, score in self.scores.items()]
+            self.unsaved = 0
+        tmpPath = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmpPath, "w", encoding="utf-8") as f:
+            json.dump(stored, f)
+        os.replace(tmpPath, self.path)
+
+
+_defaultServiceSelector = None
+_defaultServiceSelectorLock = threading.Lock()
+
+
+def get_default_service_selector() -> ServiceSelector:
+    """
+    Process-wide selector shared by every client. Set ServiceStatsFile in
+    the environment to persist the scores.
+    """
+    global _defaultServiceSelector
+    with _defaultServiceSelectorLock:
+        if _defaultServiceSelector is None:
+            _defaultServiceSelector = ServiceSelector(path=os.environ.get("ServiceStatsFile"))
+        return _defaultServiceSelector
@@ -0,0 +1,114 @@
+import asyncio
+import hashlib
+import threading
+from collections import defaultdict
+from bhashini_translator.translation_memory import TranslationMemory
+
+
+def flight_key(endPoint, pipeLineId, sourceLanguage, targetLanguage, taskTypes, data) -> tuple:
+    """
+    Identity of an inference call: where it goes, its language pair and
+    task chain, and its normalized input. Audio is identified by a hash of
+    its bytes.
+    """
+    if "asr" in taskTypes:
+        audio = data.encode("ascii") if isinstance(data, str) else bytes(data)
+        data = hashlib.sha256(audio).hexdigest()
+    elif isinstance(data, str):
+        data = TranslationMemory.normalize(data)
+    else:
+        data = tuple(TranslationMemory.normalize(text) for text in data)
+    return (endPoint, pipeLineId, sourceLanguage, targetLanguage, tuple(taskTypes), data)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Lets concurrent identical calls share one execution. The first caller
+    for a key runs it; callers arriving while it is in flight wait for it
+    and get the same result, or the same exception. Results are shared,
+    not copied, so callers must not modify them.
+
+    The sync and async paths keep separate in-flight tables. Both add to the
+    same counters: "calls" that went to the network and "shared" duplicates
+    that did not.
+    """
+
+    def __init__(self):
+        self.flights = {}
+        self.tasks = {}
+        self.lock = threading.Lock()
+        self.counters = defaultdict(int)
+
+    def do(self, key, call):
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = _Flight()
+            self.counters["calls" if leader else "shared"] += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = call()
+            return flight.result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+    async def do_async(self, key, call, timeout=None):
+        """
+        Await call() shared with identical in-flight calls on this event
+        loop. Each caller waits at most its own timeout; the shared call is
+        cancelled once every caller waiting on it has given up.
+        """
+        key = (id(asyncio.get_running_loop()), key)
+        with self.lock:
+            entry = self.tasks.get(key)
+            leader = entry is None
+            if leader:
+                task = asyncio.ensure_future(call())
+                entry = self.tasks[key] = [task, 0]
+                task.add_done_callback(lambda _: self.tasks.pop(key, None))
+            entry[1] += 1
+            self.counters["calls" if leader else "shared"] += 1
+        task = entry[0]
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                task.cancel()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return dict(self.counters, inFlight=len(self.flights) + len(self.tasks))
+
+
+_defaultSingleFlight = None
+_defaultSingleFlightLock = threading.Lock()
+
+
+def get_default_single_flight() -> SingleFlight:
+    """
+    Process-wide single-flight table shared by every client, so identical
+    calls from different sessions are merged too.
+    """
+    global _defaultSingleFlight
+    with _defaultSingleFlightLock:
+        if _defaultSingleFlight is None:
+            _defaultSingleFlight = SingleFlight()
+        return _defaultSingleFlight
@@ -0,0 +1,170 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from bhashini_translator.config import translationMemoryLruSize, translationMemoryMaxEntries
+
+
+class TranslationMemory:
+    """
+    Remembers translations keyed by (source, target, normalized text).
+
+    Lookups go to an in-process LRU first and then to an optional SQLite
+    store at `path`. The store runs in WAL mode with a busy timeout, so
+    several threads and processes on the same host can share one file;
+    each thread gets its own connection. The store is trimmed to
+    `maxEntries` rows, least recently used first.
+    """
+
+    def __init__(self, path=None, lruSize=translationMemoryLruSize, maxEntries=translationMemoryMaxEntries):
+        self.path = path
+        self.lruSize = lruSize
+        self.maxEntries = maxEntries
+        self.lru = OrderedDict()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.hits = 0
+        self.storeHits = 0
+        self.misses = 0
+        self.writes = 0
+        if self.path:
+            with self.connection() as db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS translations ("
+                    " source TEXT NOT NULL, target TEXT NOT NULL, text TEXT NOT NULL,"
+                    " translation TEXT NOT NULL, lastUsed REAL NOT NULL,"
+                    " PRIMARY KEY (source, target, text))"
+                )
+                db.execute("CREATE INDEX IF NOT EXISTS translationsLastUsed ON translations (lastUsed)")
+
+    @staticmethod
+    def normalize(text) -> str:
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+    def connection(self) -> sqlite3.Connection:
+        db = getattr(self.local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self.local.db = db
+        return db
+
+    def get(self, source, target, text):
+        key = (source, target, self.normalize(text))
+        with self.lock:
+            translation = self.lru.get(key)
+            if translation is not None:
+                self.lru.move_to_end(key)
+                self.hits += 1
+                return translation
+        if self.path:
+            with self.connection() as db:
+                row = db.execute(
+                    "SELECT translation FROM translations WHERE source = ? AND target = ? AND text = ?",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    db.execute(
+                        "UPDATE translations SET lastUsed = ? WHERE source = ? AND target = ? AND text = ?",
+                        (time.time(), *key),
+                    )
+            if row is not None:
+                self.remember(key, row[0])
+                with self.lock:
+                    self.hits += 1
+                    self.storeHits += 1
+                return row[0]
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, source, target, text, translation) -> None:
+        if not text or translation is None:
+            return
+        key = (source, target, self.normalize(text))
+        self.remember(key, translation)
+        if not self.path:
+            return
+        with self.connection() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO translations (source, target, text, translation, lastUsed)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (*key, translation, time.time()),
+            )
+        with self.lock:
+            self.writes += 1
+            trim = self.writes % 256 == 0
+        if trim:
+            self.evict()
+
+    def get_many(self, source, target, texts) -> list:
+        return [self.get(source, target, text) for text in texts]
+
+    def merge(self, source, target, texts, remembered, translated) -> list:
+        """
+        Fill the gaps (None) of a get_many lookup with freshly translated
+        texts, in order, recording each new translation.
+        """
+        translated = iter(translated)
+        targets = []
+        for text, translation in zip(texts, remembered):
+            if translation is None:
+                translation = next(translated)
+                self.put(source, target, text, translation)
+            targets.append(translation)
+        return targets
+
+    def remember(self, key, translation) -> None:
+        with self.lock:
+            self.lru[key] = translation
+            self.lru.move_to_end(key)
+            while len(self.lru) > self.lruSize:
+                self.lru.popitem(last=False)
+
+    def evict(self) -> None:
+        """
+        Trim the store to maxEntries rows, dropping the least recently used.
+        """
+        with self.connection() as db:
+            db.execute(
+                "DELETE FROM translations WHERE rowid IN ("
+                " SELECT rowid FROM translations ORDER BY lastUsed DESC LIMIT -1 OFFSET ?)",
+                (self.maxEntries,),
+            )
+
+    def size(self) -> int:
+        if not self.path:
+            return len(self.lru)
+        return self.connection().execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "storeHits": self.storeHits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "lruEntries": len(self.lru),
+            }
+
+
+_defaultTranslationMemory = None
+_defaultTranslationMemoryLock = threading.Lock()
+
+
+def get_default_translation_memory() -> TranslationMemory:
+    """
+    Process-wide translation memory shared by every client. Set
+    TranslationMemoryFile in the environment to back it with SQLite so
+    other processes on the host share it too.
+    """
+    global _defaultTranslationMemory
+    with _defaultTranslationMemoryLock:
+        if _defaultTranslationMemory is None:
+            _defaultTranslationMemory = TranslationMemory(path=os.environ.get("TranslationMemoryFile"))
+        return _defaultTranslationMemory
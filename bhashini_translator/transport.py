@@ -0,0 +1,127 @@
+import gzip
+import os
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from bhashini_translator.config import (
+    connectTimeout,
+    readTimeout,
+    poolConnections,
+    poolMaxSize,
+    gzipMinBytes,
+)
+
+
+class Transport:
+    """
+    Owns the HTTP connections used for config and inference calls.
+
+    One keep-alive requests.Session with its own connection pool is kept per
+    host, so the TLS handshake to the ULCA and inference hosts is paid once
+    per process instead of once per call. Request bodies are gzipped when
+    `gzipRequests` is set; a host that rejects a compressed body is sent the
+    plain body instead and is not sent gzip again.
+    """
+
+    def __init__(
+        self,
+        connectTimeout=connectTimeout,
+        readTimeout=readTimeout,
+        poolConnections=poolConnections,
+        poolMaxSize=poolMaxSize,
+        gzipRequests=False,
+    ) -> None:
+        self.connectTimeout = connectTimeout
+        self.readTimeout = readTimeout
+        self.poolConnections = poolConnections
+        self.poolMaxSize = poolMaxSize
+        self.gzipRequests = gzipRequests
+        self.sessions = {}
+        self.gzipRejectedHosts = set()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def host(url) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def session(self, url) -> requests.Session:
+        host = self.host(url)
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.poolConnections,
+                    pool_maxsize=self.poolMaxSize,
+                )
+                session.mount(host, adapter)
+                self.sessions[host] = session
+            return session
+
+    def post(self, url, data, headers, timeout=None, stream=False) -> requests.Response:
+        session = self.session(url)
+        timeout = timeout or (self.connectTimeout, self.readTimeout)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        host = self.host(url)
+        if (
+            self.gzipRequests
+            and isinstance(data, (bytes, bytearray))
+            and len(data) >= gzipMinBytes
+            and host not in self.gzipRejectedHosts
+        ):
+            response = session.post(
+                url,
+                data=gzip.compress(data, compresslevel=5),
+                headers=dict(headers, **{"Content-Encoding": "gzip"}),
+                timeout=timeout,
+                stream=stream,
+            )
+            if response.status_code not in (400, 415):
+                return response
+            response.close()
+            fallback = session.post(url, data=data, headers=headers, timeout=timeout, stream=stream)
+            if fallback.status_code == 200:
+                with self.lock:
+                    self.gzipRejectedHosts.add(host)
+            return fallback
+        return session.post(url, data=data, headers=headers, timeout=timeout, stream=stream)
+
+    def warm(self, url) -> None:
+        """
+        Open a pooled connection to the host of url ahead of the first real
+        call. Any response, even an error status, leaves a connection
+        with a finished TLS handshake in the pool.
+        """
+        try:
+            self.session(url).head(url, timeout=(self.connectTimeout, self.connectTimeout)).close()
+        except requests.RequestException:
+            pass
+
+    def close(self) -> None:
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_defaultTransport = None
+_defaultTransportLock = threading.Lock()
+
+
+def get_default_transport() -> Transport:
+    """
+    Process-wide transport shared by every Bhashini instance, so connections
+    are reused across instances. Set GzipRequests=1 in the environment to
+    compress request bodies.
+    """
+    global _defaultTransport
+    with _defaultTransportLock:
+        if _defaultTransport is None:
+            _defaultTransport = Transport(
+                gzipRequests=os.environ.get("GzipRequests", "").lower() in ("1", "true", "yes"),
+            )
+        return _defaultTransport
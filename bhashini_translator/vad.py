@@ -0,0 +1,183 @@
+from collections import deque
+from typing import NamedTuple
+import numpy as np
+from bhashini_translator.audio import encode_wav, parse_wav, to_mono
+from bhashini_translator.config import asrSampleRate, utteranceSilenceMs, maxUtteranceSeconds
+
+
+class VadResult(NamedTuple):
+    audio: bytes
+    totalSeconds: float
+    speechSeconds: float
+    keptSeconds: float
+
+    @property
+    def isEmpty(self) -> bool:
+        return self.speechSeconds == 0
+
+    @property
+    def keptRatio(self) -> float:
+        return self.keptSeconds / self.totalSeconds if self.totalSeconds else 0.0
+
+
+def speech_frames(
+    samples, sampleRate, frameMs=30, thresholdDb=10.0, floorDb=-50.0, loudDb=-35.0, zcrThreshold=0.25
+):
+    """
+    Flag each frame as speech or silence. A frame is speech when its energy
+    is thresholdDb above the recording's noise floor (its quietest decile)
+    or above loudDb, or when it is moderately loud with a high zero-crossing
+    rate, which catches unvoiced consonants such as "s" and "sh". Energies
+    are in dBFS and nothing below floorDb counts as speech.
+    """
+    frameLength = max(1, int(sampleRate * frameMs / 1000))
+    frameCount = len(samples) // frameLength
+    if frameCount == 0:
+        return np.zeros(0, dtype=bool), frameLength
+    frames = samples[: frameCount * frameLength].reshape(frameCount, frameLength)
+    energyDb, zeroCrossings = frame_features(frames)
+    noiseFloor = np.percentile(energyDb, 10)
+    return classify_frames(energyDb, zeroCrossings, noiseFloor, thresholdDb, floorDb, loudDb, zcrThreshold), frameLength
+
+
+def frame_features(frames):
+    """
+    Energy in dBFS and zero-crossing rate of each row of frames.
+    """
+    energyDb = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+    zeroCrossings = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+    return energyDb, zeroCrossings
+
+
+def classify_frames(energyDb, zeroCrossings, noiseFloor, thresholdDb, floorDb, loudDb, zcrThreshold):
+    voiced = energyDb > max(min(noiseFloor + thresholdDb, loudDb), floorDb)
+    unvoiced = (energyDb > max(min(noiseFloor + thresholdDb / 2, loudDb), floorDb)) & (zeroCrossings > zcrThreshold)
+    return voiced | unvoiced
+
+
+def trim_silence(wavBytes, frameMs=30, padMs=200, minSpeechMs=250, **thresholds) -> VadResult:
+    """
+    Cut leading and trailing silence from a WAV recording. The kept span
+    is re-encoded as 16-bit PCM with the original rate and channels.
+
+    Speech between the first and last speech frame is kept as-is, padded by
+    padMs on both sides. Recordings with less than minSpeechMs of speech are
+    reported as empty (VadResult.isEmpty) so callers can skip the upload.
+    """
+    wav = parse_wav(wavBytes)
+    samples = to_mono(wav.samples)
+    sampleRate = wav.sampleRate
+    totalSeconds = wav.durationSeconds
+    speech, frameLength = speech_frames(samples, sampleRate, frameMs, **thresholds)
+    speechSeconds = float(np.count_nonzero(speech)) * frameLength / sampleRate
+    if speechSeconds * 1000 < minSpeechMs:
+        return VadResult(b"", totalSeconds, 0.0, 0.0)
+    speechIndexes = np.flatnonzero(speech)
+    pad = int(sampleRate * padMs / 1000)
+    start = max(0, speechIndexes[0] * frameLength - pad)
+    end = min(len(samples), (speechIndexes[-1] + 1) * frameLength + pad)
+    audio = encode_wav(wav.samples[start:end], sampleRate)
+    return VadResult(audio, totalSeconds, speechSeconds, (end - start) / sampleRate)
+
+
+class UtteranceSegmenter:
+    """
+    Cuts a live stream of 16-bit mono PCM into utterances.
+
+    Incoming audio is split into frames and classified against a noise
+    floor tracked over the last few seconds. While idle only the last padMs
+    of audio is kept as pre-roll. Once speech starts, frames are copied into
+    a preallocated buffer of maxSeconds. The utterance ends after silenceMs
+    without speech, or when the buffer is full. feed() returns the
+    utterances that finished, as 16-bit PCM WAV bytes.
+    """
+
+    def __init__(
+        self,
+        sampleRate=asrSampleRate,
+        frameMs=30,
+        silenceMs=utteranceSilenceMs,
+        padMs=200,
+        minSpeechMs=250,
+        maxSeconds=maxUtteranceSeconds,
+        noiseWindowSeconds=3.0,
+        thresholdDb=10.0,
+        floorDb=-50.0,
+        loudDb=-35.0,
+        zcrThreshold=0.25,
+    ):
+        self.sampleRate = sampleRate
+        self.frameLength = max(1, int(sampleRate * frameMs / 1000))
+        self.silenceFrames = max(1, silenceMs // frameMs)
+        self.minSpeechFrames = max(1, minSpeechMs // frameMs)
+        self.thresholds = (thresholdDb, floorDb, loudDb, zcrThreshold)
+        self.preRoll = deque(maxlen=max(1, padMs // frameMs))
+        self.noise = deque(maxlen=max(1, int(noiseWindowSeconds * 1000 / frameMs)))
+        self.buffer = np.zeros(int(sampleRate * maxSeconds), dtype=np.int16)
+        self.length = 0
+        self.pending = bytearray()
+        self.speechFrames = 0
+        self.silentRun = 0
+        self.active = False
+
+    def feed(self, pcm) -> list:
+        self.pending += pcm
+        usable = len(self.pending) - len(self.pending) % (2 * self.frameLength)
+        if not usable:
+            return []
+        frames = np.frombuffer(bytes(self.pending[:usable]), dtype="<i2").reshape(-1, self.frameLength)
+        del self.pending[:usable]
+        energyDb, zeroCrossings = frame_features(frames.astype(np.float32) / 32768.0)
+        utterances = []
+        for frame, energy, zcr in zip(frames, energyDb, zeroCrossings):
+            self.noise.append(energy)
+            noiseFloor = np.percentile(self.noise, 10)
+            speech = bool(classify_frames(np.array([energy]), np.array([zcr]), noiseFloor, *self.thresholds)[0])
+            utterance = self.push(frame, speech)
+            if utterance is not None:
+                utterances.append(utterance)
+        return utterances
+
+    def push(self, frame, speech):
+        if not self.active:
+            self.preRoll.append(frame)
+            if not speech:
+                return None
+            self.active = True
+            for earlier in self.preRoll:
+                self.append(earlier)
+            self.preRoll.clear()
+            self.speechFrames, self.silentRun = 1, 0
+            return None
+        self.append(frame)
+        if speech:
+            self.speechFrames += 1
+            self.silentRun = 0
+        else:
+            self.silentRun += 1
+        if self.silentRun >= self.silenceFrames or self.length + self.frameLength > len(self.buffer):
+            return self.cut()
+        return None
+
+    def append(self, frame) -> None:
+        end = min(len(self.buffer), self.length + len(frame))
+        self.buffer[self.length : end] = frame[: end - self.length]
+        self.length = end
+
+    def cut(self):
+        """
+        End the current utterance. Returns its WAV bytes, or None when it
+        held too little speech to be worth sending.
+        """
+        samples = self.buffer[: self.length].astype(np.float32) / 32768.0
+        enough = self.speechFrames >= self.minSpeechFrames
+        self.length = 0
+        self.active = False
+        self.speechFrames = self.silentRun = 0
+        return encode_wav(samples, self.sampleRate) if enough else None
+
+    def flush(self) -> list:
+        if not self.active:
+            return []
+        utterance = self.cut()
+        return [utterance] if utterance is not None else []
@@ -0,0 +1,73 @@
+import threading
+import time
+from bhashini_translator.bhashini_translator import client_for
+
+
+class Warmup:
+    """
+    Resolves and caches the ASR -> NMT -> TTS configs of both directions of
+    a language pair on a background thread, then opens pooled connections
+    to the inference host, so the first utterance runs at steady-state
+    latency. `status` is "pending", "ready" or "failed".
+    """
+
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self, firstLanguage, secondLanguage, clientFactory=client_for):
+        self.languages = (firstLanguage, secondLanguage)
+        self.clientFactory = clientFactory
+        self.status = self.PENDING
+        self.error = None
+        self.seconds = None
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=f"bhashini-warmup-{firstLanguage}-{secondLanguage}", daemon=True)
+
+    def start(self) -> "Warmup":
+        self.thread.start()
+        return self
+
+    def run(self) -> None:
+        started = time.perf_counter()
+        try:
+            firstLanguage, secondLanguage = self.languages
+            directions = [(firstLanguage, secondLanguage)]
+            if secondLanguage != firstLanguage:
+                directions.append((secondLanguage, firstLanguage))
+            for sourceLanguage, targetLanguage in directions:
+                client = self.clientFactory(sourceLanguage, targetLanguage)
+                pipeline = client.resolvePipeLine(["asr", "translation", "tts"])
+                client.transport.warm(pipeline.callbackUrl)
+            self.status = self.READY
+        except Exception as error:
+            self.error = error
+            self.status = self.FAILED
+        finally:
+            self.seconds = time.perf_counter() - started
+            self.done.set()
+
+    def is_ready(self) -> bool:
+        return self.status == self.READY
+
+    def wait(self, timeout=None) -> bool:
+        self.done.wait(timeout)
+        return self.is_ready()
+
+
+_warmups = {}
+_warmupsLock = threading.Lock()
+
+
+def warm_up(firstLanguage, secondLanguage, clientFactory=client_for) -> Warmup:
+    """
+    Start warming a language pair in the background, or return the warm-up
+    already running or finished for it. Failed warm-ups are retried.
+    """
+    key = tuple(sorted((firstLanguage, secondLanguage)))
+    with _warmupsLock:
+        warmup = _warmups.get(key)
+        if warmup is None or warmup.status == Warmup.FAILED:
+            warmup = Warmup(firstLanguage, secondLanguage, clientFactory).start()
+            _warmups[key] = warmup
+        return warmup
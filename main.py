@@ -1,8 +1,15 @@
 from dotenv import load_dotenv
 import os
+import argparse
 import base64
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import speech_recognition as sr
-from bhashini_translator import Bhashini
+from bhashini_translator import Bhashini, client_for
+from bhashini_translator.audio import normalize_for_asr
+from bhashini_translator.config import asrSampleRate, captureWorkers
+from bhashini_translator.vad import UtteranceSegmenter, trim_silence
 
 load_dotenv()
 
@@ -26,24 +33,117 @@ def wav_bytes_to_base64(wav_bytes):
     return base64.b64encode(wav_bytes).decode("utf-8")
 
 def speech_to_speech_from_mic(source_lang, target_lang, duration=5, output_file="output_speech_to_speech.wav"):
-    # Record audio from mic
+    # Record audio from mic, convert it to 16 kHz mono and trim the silence around the speech
     wav_bytes = record_audio(duration=duration)
-    audio_b64 = wav_bytes_to_base64(wav_bytes)
+    vad = trim_silence(normalize_for_asr(wav_bytes).audio)
+    if vad.isEmpty:
+        print("No speech detected, nothing to translate.")
+        return
+    print(f"Kept {vad.keptSeconds:.1f}s of {vad.totalSeconds:.1f}s ({vad.speechSeconds:.1f}s of speech).")
 
     # Create translator instance
     translator = Bhashini(sourceLanguage=source_lang, targetLanguage=target_lang)
-    translator.getPipeLineConfig("asr")
 
-    # ASR -> NMT -> TTS
-    translated_audio_b64 = translator.asr_nmt_tts(audio_b64)
-
-    # Save output WAV
+    # ASR -> NMT -> TTS, decoding the translated audio into the output WAV as it downloads
     with open(output_file, "wb") as f:
-        f.write(base64.b64decode(translated_audio_b64))
+        translator.asr_nmt_tts_to(vad.audio, f)
     print(f"Translated speech-to-speech audio saved as: {output_file}")
 
-if __name__ == "__main__":
-    # Example: English -> Hindi, record for 7 seconds
-    speech_to_speech_from_mic(source_lang="hi", target_lang="pa", duration=5)
+def capture_utterances(segmenter, on_utterance, stop):
+    """
+    Capture thread: read the microphone until stop is set and hand every
+    utterance the segmenter cuts on silence to on_utterance.
+    """
+    with sr.Microphone(sample_rate=asrSampleRate) as source:
+        print("Listening continuously. Press Ctrl+C to stop.")
+        while not stop.is_set():
+            pcm = source.stream.read(source.CHUNK)
+            for wav in segmenter.feed(pcm):
+                on_utterance(wav)
+    for wav in segmenter.flush():
+        on_utterance(wav)
 
+def translate_utterance(translator, wav_bytes):
+    vad = trim_silence(wav_bytes)
+    if vad.isEmpty:
+        return None
+    return translator.speech_turn(vad.audio)
+
+def continuous_speech_to_speech(source_lang, target_lang, workers=captureWorkers, output_dir="output_speech_to_speech"):
+    """
+    Always-on counter loop: capture keeps running while earlier utterances
+    are translated on a worker pool, and results are written in the order
+    they were spoken.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    translator = client_for(source_lang, target_lang)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    results = queue.Queue()
+    stop = threading.Event()
 
+    def submit(wav):
+        results.put(executor.submit(translate_utterance, translator, wav))
+
+    def capture():
+        try:
+            capture_utterances(UtteranceSegmenter(), submit, stop)
+        finally:
+            results.put(None)
+
+    capture_thread = threading.Thread(target=capture, name="capture", daemon=True)
+    capture_thread.start()
+    index = 0
+    current = None
+
+    def drain():
+        # The future being waited on is kept in current, so an interrupt
+        # while waiting does not lose it.
+        nonlocal index, current
+        while True:
+            if current is None:
+                current = results.get()
+                if current is None:
+                    return
+            try:
+                turn = current.result()
+            except Exception as error:
+                print(f"Utterance failed: {error}")
+                turn = None
+            current = None
+            if turn is None:
+                continue
+            index += 1
+            output_file = os.path.join(output_dir, f"utterance_{index:04d}.wav")
+            with open(output_file, "wb") as f:
+                f.write(base64.b64decode(turn.audioContent))
+            print(f"[{index}] {turn.transcript} -> {turn.translation} ({output_file})")
+
+    cancel = False
+    try:
+        drain()
+    except KeyboardInterrupt:
+        # Stop listening, but still translate what was already heard,
+        # including the last utterance the segmenter flushes.
+        print("Stopping... finishing queued utterances, press Ctrl+C again to discard them.")
+        stop.set()
+        try:
+            capture_thread.join()
+            drain()
+        except KeyboardInterrupt:
+            print("Discarding queued utterances.")
+            cancel = True
+    finally:
+        executor.shutdown(wait=not cancel, cancel_futures=cancel)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Speech-to-speech translation from the microphone")
+    parser.add_argument("--source", default="hi", help="language spoken into the microphone")
+    parser.add_argument("--target", default="pa", help="language to translate into")
+    parser.add_argument("--duration", type=int, default=5, help="seconds to record in one-shot mode")
+    parser.add_argument("--continuous", action="store_true", help="keep listening and translate each utterance")
+    parser.add_argument("--workers", type=int, default=captureWorkers, help="utterances translated in parallel")
+    args = parser.parse_args()
+    if args.continuous:
+        continuous_speech_to_speech(args.source, args.target, workers=args.workers)
+    else:
+        speech_to_speech_from_mic(source_lang=args.source, target_lang=args.target, duration=args.duration)
@@ -0,0 +1,53 @@
+import pytest
+from bhashini_translator.mock_server import MockBhashini
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv("userID", "test-user")
+    monkeypatch.setenv("ulcaApiKey", "test-key")
+
+
+@pytest.fixture
+def mock():
+    with MockBhashini(seed=1) as server:
+        yield server
+
+
+@pytest.fixture
+def make_client(mock):
+    """
+    Build a Bhashini client against the mock with private state, so tests
+    do not share caches, breakers or scores. Keyword arguments override
+    any component.
+    """
+    from bhashini_translator.audio_codec import AudioCodec
+    from bhashini_translator.bhashini_translator import Bhashini
+    from bhashini_translator.config_cache import ConfigCache
+    from bhashini_translator.ratelimit import ApiLimiter
+    from bhashini_translator.resilience import Resilience, RetryPolicy
+    from bhashini_translator.scheduler import Scheduler
+    from bhashini_translator.service_selector import ServiceSelector
+    from bhashini_translator.single_flight import SingleFlight
+    from bhashini_translator.translation_memory import TranslationMemory
+    from bhashini_translator.transport import Transport
+
+    unlimited = (1e9, 1e9)
+
+    def build(sourceLanguage="hi", targetLanguage="en", **overrides) -> Bhashini:
+        components = dict(
+            configCache=ConfigCache(),
+            transport=Transport(),
+            ulcaEndPoint=mock.ulcaEndPoint,
+            translationMemory=TranslationMemory(),
+            resilience=Resilience(defaultPolicy=RetryPolicy(deadline=5.0, baseDelay=0.01, maxDelay=0.02)),
+            apiLimiter=ApiLimiter(budgets={"config": unlimited, "inference": unlimited}),
+            audioCodec=AudioCodec(asrFormat="wav", ttsFormat="wav"),
+            singleFlight=SingleFlight(),
+            serviceSelector=ServiceSelector(),
+            scheduler=Scheduler(),
+        )
+        components.update(overrides)
+        return Bhashini(sourceLanguage, targetLanguage, **components)
+
+    return build
@@ -0,0 +1,35 @@
+import struct
+import pytest
+from bhashini_translator.audio import normalize_for_asr, parse_wav, wav_duration
+from bhashini_translator.mock_server import tone_wav
+
+
+def test_duration_from_header():
+    assert wav_duration(tone_wav(1.5, sampleRate=16000)) == pytest.approx(1.5)
+
+
+@pytest.mark.parametrize(
+    "recording",
+    [
+        b"",
+        b"not a wav file at all",
+        tone_wav(0.1)[:30],
+        b"RIFF" + struct.pack("<I", 0) + b"WAVE" + b"fmt " + struct.pack("<I", 16) + b"\x01\x00",
+        b"RIFF" + struct.pack("<I", 0) + b"WAVE" + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 0, 16000, 0, 0, 16) + b"data" + struct.pack("<I", 4) + b"\0" * 4,
+    ],
+)
+def test_unreadable_recording_raises_value_error(recording):
+    with pytest.raises(ValueError):
+        wav_duration(recording)
+
+
+def wav_header(channels, bitsPerSample):
+    fmt = struct.pack("<IHHIIHH", 16, 1, channels, 16000, 0, 0, bitsPerSample)
+    return b"RIFF" + struct.pack("<I", 0) + b"WAVE" + b"fmt " + fmt + b"data" + struct.pack("<I", 8) + b"\0" * 8
+
+
+@pytest.mark.parametrize("channels, bitsPerSample", [(1, 0), (1, 4), (0, 16)])
+@pytest.mark.parametrize("decode", [parse_wav, normalize_for_asr, wav_duration])
+def test_impossible_sample_format_raises_value_error(decode, channels, bitsPerSample):
+    with pytest.raises(ValueError):
+        decode(wav_header(channels, bitsPerSample))
@@ -0,0 +1,33 @@
+from bhashini_translator.audio import wav_duration
+from bhashini_translator.audio_cache import AudioCache
+
+
+def test_repeated_phrase_is_synthesized_once(make_client, mock, tmp_path):
+    translator = make_client(audioCache=AudioCache(str(tmp_path)))
+    clips = [bytes(translator.tts_wav("platform number two")) for _ in range(6)]
+    assert mock.stats()["inferenceCalls"] == 1
+    assert all(clip == clips[0] for clip in clips)
+    assert wav_duration(clips[0]) > 0
+
+
+def test_clip_is_stored_under_the_service_that_made_it(make_client, mock, tmp_path):
+    requests = []
+    inference = mock.inference
+    mock.inference = lambda request: requests.append(request) or inference(request)
+    audioCache = AudioCache(str(tmp_path))
+    make_client(audioCache=audioCache).tts_wav("platform number two")
+    tts = requests[0]["pipelineTasks"][0]["config"]
+    key = AudioCache.key(tts["language"]["sourceLanguage"], tts["gender"], tts["serviceId"], "platform number two")
+    assert audioCache.get(key) is not None
+
+
+def test_full_cache_is_not_rescanned_on_every_put(tmp_path):
+    audioCache = AudioCache(str(tmp_path), maxBytes=10_000, lowWater=0.5)
+    scans = []
+    files = audioCache.files
+    audioCache.files = lambda: scans.append(1) or files()
+    for index in range(100):
+        audioCache.put(AudioCache.key("hi", "female", "tts", str(index)), b"\0" * 1000)
+    assert audioCache.stats()["totalBytes"] <= 10_000
+    assert len(scans) <= 100 // 5
+    assert audioCache.get(AudioCache.key("hi", "female", "tts", "99")) is not None
@@ -0,0 +1,55 @@
+import pytest
+from bhashini_translator.audio_codec import AudioCodec
+from bhashini_translator.errors import BhashiniAPIError
+from bhashini_translator.mock_server import MockBhashini, tone_wav
+
+soundfile = pytest.importorskip("soundfile")
+
+
+class FlacRejectingMock(MockBhashini):
+    def inference(self, request):
+        for taskTypeConfig in request["pipelineTasks"]:
+            if taskTypeConfig["config"].get("audioFormat") == "flac":
+                raise ValueError("Unsupported audioFormat: flac")
+        return super().inference(request)
+
+
+@pytest.fixture
+def mock():
+    with FlacRejectingMock(seed=1) as server:
+        yield server
+
+
+def flac_codec() -> AudioCodec:
+    codec = AudioCodec(asrFormat="flac", ttsFormat="wav")
+    if codec.asrFormat != "flac":
+        pytest.skip("soundfile has no FLAC support")
+    return codec
+
+
+def test_rejected_format_falls_back_to_wav(make_client, mock):
+    codec = flac_codec()
+    translator = make_client(audioCodec=codec)
+    assert translator.asr(tone_wav(1.0, sampleRate=16000)) == mock.transcript
+    assert codec.formats(["asr"]) == {}
+    assert mock.stats()["badRequests"] == 1
+    translator.asr(tone_wav(1.5, sampleRate=16000))
+    assert mock.stats()["badRequests"] == 1
+
+
+def test_unrelated_400_keeps_compression(make_client, mock):
+    codec = flac_codec()
+    mock.errorRate = 1.0
+    mock.errorStatus = 400
+    with pytest.raises(BhashiniAPIError):
+        make_client(audioCodec=codec).asr(tone_wav(1.0, sampleRate=16000))
+    assert codec.formats(["asr"]) == {"asr": "flac"}
+
+
+def test_compressed_audio_round_trips():
+    codec = flac_codec()
+    wavBytes = tone_wav(1.0, sampleRate=16000)
+    encoded = codec.encode(wavBytes, "flac")
+    assert len(encoded) < len(wavBytes)
+    stats = codec.stats()["asr/flac"]
+    assert stats["clips"] == 1 and stats["wireBytes"] < stats["wavBytes"]
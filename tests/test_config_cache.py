@@ -0,0 +1,29 @@
+import json
+import threading
+import time
+from bhashini_translator import config_cache
+from bhashini_translator.config_cache import ConfigCache
+
+endPoint = {"callbackUrl": "http://localhost/inference", "inferenceApiKey": {"name": "Authorization", "value": "key"}}
+
+
+def test_slow_save_does_not_overwrite_a_newer_one(tmp_path, monkeypatch):
+    path = str(tmp_path / "config.json")
+    cache = ConfigCache(path=path)
+    dump = json.dump
+    slow = threading.Event()
+
+    def slow_first_dump(stored, f):
+        if not slow.is_set():
+            slow.set()
+            time.sleep(0.2)
+        dump(stored, f)
+
+    monkeypatch.setattr(config_cache.json, "dump", slow_first_dump)
+    first = threading.Thread(target=cache.put, args=(("p", "asr"), "asr-1", endPoint))
+    first.start()
+    slow.wait()
+    cache.put(("p", "tts"), "tts-1", endPoint)
+    first.join()
+    monkeypatch.setattr(config_cache.json, "dump", dump)
+    assert ConfigCache(path=path).entries.keys() == {("p", "asr"), ("p", "tts")}
@@ -0,0 +1,22 @@
+import json
+import socket
+import struct
+import time
+from bhashini_translator.mock_server import configPath
+
+
+def test_client_hanging_up_is_counted_not_logged(mock, capfd):
+    mock.configLatency = 0.3
+    body = json.dumps({"pipelineTasks": [{"taskType": "asr", "config": {}}]}).encode("utf-8")
+    host, port = mock.server.server_address[:2]
+    for _ in range(3):
+        with socket.create_connection((host, port)) as connection:
+            connection.sendall(
+                f"POST {configPath} HTTP/1.1\r\nHost: mock\r\nuserID: u\r\nulcaApiKey: k\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+            )
+            # Reset rather than close, as a client abandoning a request does.
+            connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+    time.sleep(0.6)
+    assert "Traceback" not in capfd.readouterr().err
+    assert mock.stats()["abandoned"] == 3
@@ -0,0 +1,113 @@
+import asyncio
+import time
+import pytest
+import requests
+from bhashini_translator.errors import CircuitOpenError
+from bhashini_translator.ratelimit import ApiLimiter, CircuitBreaker
+
+unlimited = (1e9, 1e9)
+
+
+def open_limiter(resetTimeout=0.05, budgets=None) -> ApiLimiter:
+    """
+    A limiter whose inference circuit has just opened.
+    """
+    limiter = ApiLimiter(budgets=budgets or {"inference": unlimited}, failureThreshold=1, resetTimeout=resetTimeout)
+    limiter.before("inference")
+    limiter.after("inference", 503)
+    return limiter
+
+
+def test_breaker_half_opens_and_closes_on_success():
+    breaker = CircuitBreaker(failureThreshold=2, resetTimeout=0.05)
+    breaker.record(False)
+    breaker.record(False)
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record(True)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_opens_again():
+    breaker = CircuitBreaker(failureThreshold=1, resetTimeout=0.05)
+    breaker.record(False)
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_sync_probe_slot_freed_after_unexpected_error():
+    limiter = open_limiter()
+    time.sleep(0.06)
+
+    def broken():
+        raise KeyError("not a network error")
+
+    with pytest.raises(KeyError):
+        limiter.call("inference", broken)
+    response = requests.Response()
+    response.status_code = 200
+    assert limiter.call("inference", lambda: response) is response
+
+
+def test_sync_failure_reopens():
+    limiter = open_limiter()
+    time.sleep(0.06)
+
+    def unreachable():
+        raise requests.ConnectionError("down")
+
+    with pytest.raises(requests.ConnectionError):
+        limiter.call("inference", unreachable)
+    with pytest.raises(CircuitOpenError):
+        limiter.before("inference")
+
+
+def test_async_probe_slot_freed_when_token_wait_is_cancelled():
+    # The one token went to the call that tripped the breaker.
+    limiter = open_limiter(budgets={"inference": (1.0, 1)})
+    time.sleep(0.06)
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.before_async("inference"), 0.05)
+        assert limiter.breakers["inference"].allow()
+
+    asyncio.run(main())
+
+
+def test_async_probe_slot_freed_when_request_is_cancelled(mock):
+    pytest.importorskip("aiohttp")
+    from bhashini_translator.async_bhashini import AsyncBhashini
+    from bhashini_translator.config_cache import ConfigCache
+    from bhashini_translator.single_flight import SingleFlight
+    from bhashini_translator.translation_memory import TranslationMemory
+
+    limiter = ApiLimiter(budgets={"config": unlimited, "inference": unlimited}, failureThreshold=1, resetTimeout=0.05)
+
+    async def main():
+        async with AsyncBhashini(
+            "hi",
+            "en",
+            configCache=ConfigCache(),
+            ulcaEndPoint=mock.ulcaEndPoint,
+            translationMemory=TranslationMemory(),
+            apiLimiter=limiter,
+            singleFlight=SingleFlight(),
+        ) as client:
+            await client.translate("warm up the config")
+            limiter.before("inference")
+            limiter.after("inference", 503)
+            await asyncio.sleep(0.06)
+            mock.latency = 0.5
+            with pytest.raises(asyncio.TimeoutError):
+                await client.translate("the probe times out", deadline=0.1)
+            mock.latency = 0.0
+            assert await client.translate("next call") == "[en] next call"
+
+    asyncio.run(main())
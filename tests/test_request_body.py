@@ -0,0 +1,51 @@
+import base64
+import json
+import tracemalloc
+from bhashini_translator.config import bodyChunkSize
+from bhashini_translator.request_body import base64_length, build_audio_body, split_envelope
+
+
+def envelope():
+    return split_envelope(
+        {"pipelineTasks": [{"taskType": "asr"}], "inputData": {"audio": [{"audioContent": None}]}},
+        ("inputData", "audio", 0, "audioContent"),
+    )
+
+
+def test_body_memory_is_bounded_by_the_chunk_size():
+    prefix, suffix = envelope()
+    audio = bytes(range(256)) * (30 * 16000 * 2 // 256)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        body = build_audio_body(prefix, audio, suffix)
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    assert len(body) == len(prefix) + base64_length(len(audio)) + len(suffix)
+    # Only the body and one encoded chunk are ever alive together; encoding
+    # a chunk briefly takes about 1.5 times its encoded size.
+    assert peak - len(body) <= 2 * base64_length(bodyChunkSize)
+    assert peak < 2 * len(body)
+
+
+def test_body_matches_json_dumps_byte_for_byte():
+    prefix, suffix = envelope()
+    for size in (0, 1, 2, 3, bodyChunkSize - 1, bodyChunkSize, bodyChunkSize + 1, 3 * bodyChunkSize + 2):
+        audio = bytes(index % 251 for index in range(size))
+        expected = json.dumps(
+            {
+                "pipelineTasks": [{"taskType": "asr"}],
+                "inputData": {"audio": [{"audioContent": base64.b64encode(audio).decode("ascii")}]},
+            }
+        ).encode("ascii")
+        assert bytes(build_audio_body(prefix, audio, suffix)) == expected
+
+
+def test_audio_payload_is_the_same_for_bytes_and_base64(make_client):
+    translator = make_client()
+    pipelineTasks = translator.getPipeLineConfigs(["asr", "translation", "tts"])
+    audio = bytes(range(256)) * 100
+    fromBytes = translator.asr_nmt_tts_payload(audio, pipelineTasks=pipelineTasks)
+    fromBase64 = translator.asr_nmt_tts_payload(base64.b64encode(audio).decode("ascii"), pipelineTasks=pipelineTasks)
+    assert bytes(fromBytes) == fromBase64.encode("utf-8")
@@ -0,0 +1,53 @@
+import pytest
+from bhashini_translator.errors import BhashiniAPIError
+from bhashini_translator.ratelimit import ApiLimiter
+from bhashini_translator.resilience import Resilience, RetryPolicy
+
+unlimited = (1e9, 1e9)
+
+
+def resilience(maxAttempts) -> Resilience:
+    return Resilience(defaultPolicy=RetryPolicy(deadline=5.0, maxAttempts=maxAttempts, baseDelay=0.01, maxDelay=0.02))
+
+
+def test_server_errors_retry_with_backoff_only(make_client, mock):
+    mock.errorRate = 1.0
+    apiLimiter = ApiLimiter(budgets={"config": unlimited, "inference": unlimited})
+    with pytest.raises(BhashiniAPIError) as raised:
+        make_client(apiLimiter=apiLimiter, resilience=resilience(3)).translate("where is platform two")
+    assert raised.value.statusCode == 503
+    assert mock.stats()["inferenceCalls"] == 3
+    assert mock.stats()["configCalls"] == 1
+    # One logical call must not trip the breaker on its own.
+    assert apiLimiter.stats()["inference"]["breaker"]["state"] == "closed"
+
+
+def test_transient_error_is_retried(make_client, mock):
+    mock.errorRate = 0.5
+    translator = make_client(resilience=resilience(10))
+    for index in range(5):
+        assert translator.translate(f"ticket {index}") == f"[en] ticket {index}"
+    assert mock.stats().get("inferenceErrors", 0) > 0
+
+
+def test_client_errors_are_not_retried(make_client, mock):
+    mock.errorRate = 1.0
+    mock.errorStatus = 400
+    with pytest.raises(BhashiniAPIError):
+        make_client(resilience=resilience(3)).translate("bad input")
+    assert mock.stats()["inferenceCalls"] == 1
+
+
+def test_stale_config_is_refetched_once(make_client, mock, monkeypatch):
+    translator = make_client()
+    translator.translate("first")
+    monkeypatch.setattr("bhashini_translator.mock_server.inferenceApiKey", "rotated-key")
+    assert translator.translate("second") == "[en] second"
+    assert mock.stats()["configCalls"] == 2
+
+
+def test_deadline_bounds_a_slow_call(make_client, mock):
+    mock.latency = 1.0
+    policy = RetryPolicy(deadline=0.3, maxAttempts=3, baseDelay=0.01, maxDelay=0.02)
+    with pytest.raises(BhashiniAPIError):
+        make_client(resilience=Resilience(defaultPolicy=policy)).translate("too slow")
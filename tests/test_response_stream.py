@@ -0,0 +1,43 @@
+import base64
+import io
+import json
+import pytest
+from bhashini_translator.mock_server import tone_wav
+from bhashini_translator.response_stream import stream_audio_content
+
+
+def chunked(data, size):
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunkSize", [1, 3, 7, 64, 4096, 1 << 20])
+def test_streamed_audio_is_byte_identical(chunkSize):
+    wavBytes = tone_wav(0.5)
+    response = {
+        "pipelineResponse": [
+            {"taskType": "translation", "output": [{"source": "a", "target": "b"}]},
+            {"taskType": "tts", "audio": [{"audioContent": base64.b64encode(wavBytes).decode("ascii")}]},
+        ]
+    }
+    sink = io.BytesIO()
+    extractor = stream_audio_content(chunked(json.dumps(response).encode("utf-8"), chunkSize), sink)
+    assert sink.getvalue() == wavBytes
+    assert extractor.bytesWritten == len(wavBytes)
+    rest = extractor.finish()
+    assert rest["pipelineResponse"][0] == response["pipelineResponse"][0]
+    assert rest["pipelineResponse"][1]["audio"][0]["audioContent"] == ""
+
+
+def test_escaped_slashes_are_decoded():
+    wavBytes = bytes(range(256)) * 4
+    encoded = base64.b64encode(wavBytes).decode("ascii").replace("/", "\\/")
+    body = ('{"audio": [{"audioContent": "' + encoded + '"}]}').encode("ascii")
+    sink = io.BytesIO()
+    stream_audio_content(chunked(body, 5), sink).finish()
+    assert sink.getvalue() == wavBytes
+
+
+def test_truncated_response_is_an_error():
+    body = b'{"audio": [{"audioContent": "UklGRg'
+    with pytest.raises(ValueError):
+        stream_audio_content([body], io.BytesIO()).finish()
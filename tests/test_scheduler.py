@@ -0,0 +1,85 @@
+import threading
+import time
+import pytest
+from bhashini_translator.scheduler import BATCH, INTERACTIVE, Scheduler, current_lane, in_lane, lane
+
+
+def blocked_scheduler(**options):
+    """
+    A scheduler whose workers are all busy until the returned event is set.
+    """
+    scheduler = Scheduler(**options)
+    release = threading.Event()
+    started = []
+    for _ in range(scheduler.workers):
+        scheduler.submit(INTERACTIVE, lambda: started.append(1) or release.wait(5))
+    while len(started) < scheduler.workers:
+        time.sleep(0.001)
+    return scheduler, release
+
+
+def test_interactive_jobs_jump_the_batch_queue():
+    scheduler, release = blocked_scheduler(workers=1, batchWorkers=1, agingSeconds=60)
+    order = []
+    futures = [scheduler.submit(BATCH, order.append, f"batch-{index}") for index in range(3)]
+    futures += [scheduler.submit(INTERACTIVE, order.append, f"interactive-{index}") for index in range(2)]
+    release.set()
+    for future in futures:
+        future.result(5)
+    assert order == ["interactive-0", "interactive-1", "batch-0", "batch-1", "batch-2"]
+    scheduler.shutdown()
+
+
+def test_aged_batch_job_runs_in_arrival_order():
+    scheduler, release = blocked_scheduler(workers=1, batchWorkers=1, agingSeconds=0.05)
+    order = []
+    futures = [scheduler.submit(BATCH, order.append, "batch")]
+    time.sleep(0.1)
+    futures.append(scheduler.submit(INTERACTIVE, order.append, "interactive"))
+    release.set()
+    for future in futures:
+        future.result(5)
+    assert order == ["batch", "interactive"]
+    assert scheduler.stats()[BATCH]["aged"] == 1
+    scheduler.shutdown()
+
+
+def test_batch_jobs_leave_workers_for_interactive():
+    scheduler = Scheduler(workers=3, batchWorkers=1, agingSeconds=60)
+    release = threading.Event()
+    running = []
+    lock = threading.Lock()
+
+    def job():
+        with lock:
+            running.append(1)
+        release.wait(5)
+
+    batch = [scheduler.submit(BATCH, job) for _ in range(4)]
+    time.sleep(0.1)
+    assert len(running) == 1
+    assert scheduler.run(INTERACTIVE, lambda: "served") == "served"
+    release.set()
+    for future in batch:
+        future.result(5)
+    scheduler.shutdown()
+
+
+def test_lane_follows_the_calling_context():
+    @in_lane(BATCH)
+    def batch_work():
+        return current_lane()
+
+    assert current_lane() == INTERACTIVE
+    assert batch_work() == BATCH
+    with lane(BATCH):
+        assert current_lane() == BATCH
+    assert current_lane() == INTERACTIVE
+
+
+def test_errors_reach_the_caller():
+    scheduler = Scheduler(workers=1)
+    with pytest.raises(ZeroDivisionError):
+        scheduler.run(INTERACTIVE, lambda: 1 / 0)
+    assert scheduler.stats()[INTERACTIVE]["failed"] == 1
+    scheduler.shutdown()
@@ -0,0 +1,24 @@
+import pytest
+from bhashini_translator.segmenter import split_sentences
+
+
+@pytest.mark.parametrize(
+    "text, sentences",
+    [
+        ("Really?! Yes.", ["Really?!", "Yes."]),
+        ("क्या?? हाँ।", ["क्या??", "हाँ।"]),
+        ("ट्रेन आ गई॥ चलिए।", ["ट्रेन आ गई॥", "चलिए।"]),
+        ("Mr. Sharma is at counter 4. Please wait.", ["Mr. Sharma is at counter 4.", "Please wait."]),
+        ("Dr. R. K. Singh will see you.", ["Dr. R. K. Singh will see you."]),
+        ("The train leaves at 12.30 today. Platform 2.", ["The train leaves at 12.30 today.", "Platform 2."]),
+        ("यह क्या है؟ ٹکٹ یہاں ہے۔", ["यह क्या है؟", "ٹکٹ یہاں ہے۔"]),
+        ("Wait... Then go.", ["Wait...", "Then go."]),
+    ],
+)
+def test_split_sentences(text, sentences):
+    assert split_sentences(text) == sentences
+
+
+def test_text_is_unchanged_apart_from_whitespace():
+    text = "Really?! Mr. Sharma, your ticket is ready. धन्यवाद।"
+    assert " ".join(split_sentences(text)) == text
@@ -0,0 +1,41 @@
+from bhashini_translator.service_selector import ServiceSelector
+
+chain = "translation"
+taskTypeConfig = {"taskType": "translation", "config": {"language": {"sourceLanguage": "hi", "targetLanguage": "en"}}}
+
+
+def record(selector, serviceId, seconds, success):
+    tasks = [dict(taskTypeConfig, config=dict(taskTypeConfig["config"], serviceId=serviceId))]
+    selector.record(chain, tasks, seconds, success)
+
+
+def test_service_that_never_succeeded_is_not_ranked():
+    selector = ServiceSelector(exploreRate=0.0, minSamples=3)
+    for _ in range(3):
+        record(selector, "a", None, False)
+        record(selector, "b", 0.5, True)
+    assert selector.choose(chain, taskTypeConfig, ["a", "b"]) == "b"
+
+
+def test_fastest_healthy_service_wins():
+    selector = ServiceSelector(exploreRate=0.0, minSamples=3)
+    for _ in range(3):
+        record(selector, "slow", 0.9, True)
+        record(selector, "fast", 0.2, True)
+    assert selector.choose(chain, taskTypeConfig, ["slow", "fast"]) == "fast"
+
+
+def test_least_failing_service_when_none_is_healthy():
+    selector = ServiceSelector(exploreRate=0.0, minSamples=3, maxErrorRate=0.1)
+    for _ in range(3):
+        record(selector, "a", None, False)
+    for success in (False, True, True):
+        record(selector, "b", 0.4, success)
+    assert selector.choose(chain, taskTypeConfig, ["a", "b"]) == "b"
+
+
+def test_unsampled_service_is_tried_first():
+    selector = ServiceSelector(exploreRate=0.0, minSamples=3)
+    for _ in range(3):
+        record(selector, "a", 0.1, True)
+    assert selector.choose(chain, taskTypeConfig, ["a", "b"]) == "b"
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from bhashini_translator.single_flight import SingleFlight, flight_key
+
+
+def test_concurrent_callers_share_one_call():
+    singleFlight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"result": 42}
+
+    with ThreadPoolExecutor(4) as pool:
+        leader = pool.submit(singleFlight.do, "key", call)
+        started.wait(5)
+        followers = [pool.submit(singleFlight.do, "key", call) for _ in range(3)]
+        while singleFlight.stats().get("shared", 0) < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert singleFlight.stats() == {"calls": 1, "shared": 3, "inFlight": 0}
+
+
+def test_followers_get_the_leaders_error():
+    singleFlight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def call():
+        started.set()
+        release.wait(5)
+        raise ValueError("service down")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(singleFlight.do, "key", call)
+        started.wait(5)
+        follower = pool.submit(singleFlight.do, "key", call)
+        while singleFlight.stats().get("shared", 0) < 1:
+            time.sleep(0.001)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+    # A later call runs again instead of reusing the failure.
+    assert singleFlight.do("key", lambda: "ok") == "ok"
+
+
+def test_async_callers_share_one_call():
+    singleFlight = SingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        return await asyncio.gather(*[singleFlight.do_async("key", call) for _ in range(5)])
+
+    assert asyncio.run(main()) == ["done"] * 5
+    assert len(calls) == 1
+
+
+def test_flight_key_normalizes_text_and_hashes_audio():
+    common = ("endpoint", "pipeline", "hi", "en")
+    assert flight_key(*common, ["translation"], "  where   is\tplatform 2 ") == flight_key(
+        *common, ["translation"], "where is platform 2"
+    )
+    audio = flight_key(*common, ["asr"], b"\0" * 1000)
+    assert audio == flight_key(*common, ["asr"], bytearray(1000))
+    assert len(audio[-1]) == 64
+
+
+def test_identical_translations_reach_the_service_once(make_client, mock):
+    mock.latency = 0.2
+    translator = make_client()
+    translator.translate("warm up")
+    with ThreadPoolExecutor(6) as pool:
+        results = list(pool.map(translator.translate, ["Where is platform two?"] * 6))
+    assert results == ["[en] Where is platform two?"] * 6
+    assert mock.stats()["inferenceCalls"] == 2
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+import pytest
+from bhashini_translator.config_cache import ConfigCache
+from bhashini_translator.single_flight import SingleFlight
+from bhashini_translator.translation_memory import TranslationMemory
+
+
+class ThreadRecordingMemory(TranslationMemory):
+    def __init__(self, path):
+        self.threads = []
+        super().__init__(path=path)
+
+    def connection(self):
+        self.threads.append(threading.get_ident())
+        return super().connection()
+
+
+def test_async_client_keeps_sqlite_off_the_event_loop(mock, tmp_path):
+    pytest.importorskip("aiohttp")
+    from bhashini_translator.async_bhashini import AsyncBhashini
+
+    memory = ThreadRecordingMemory(str(tmp_path / "memory.db"))
+    memory.threads.clear()
+
+    async def main():
+        async with AsyncBhashini(
+            "hi",
+            "en",
+            configCache=ConfigCache(),
+            ulcaEndPoint=mock.ulcaEndPoint,
+            translationMemory=memory,
+            singleFlight=SingleFlight(),
+        ) as client:
+            assert await client.translate("one ticket") == "[en] one ticket"
+            assert await client.translate_batch(["one ticket", "two tickets"]) == ["[en] one ticket", "[en] two tickets"]
+        return threading.get_ident()
+
+    loopThread = asyncio.run(main())
+    assert memory.threads
+    assert loopThread not in memory.threads
+    assert memory.size() == 2